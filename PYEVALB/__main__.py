@@ -13,24 +13,96 @@
 Comamnd interface
 """
 import argparse
-
-from PYEVALB.scorer import Scorer
+import sys
 
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument('gold_path', help='The path of gold tree bank.',
+    parser.add_argument('gold_path', help=('The path of gold tree bank, '
+                                           'bracket text or binary.'),
                         type=str)
 
-    parser.add_argument('test_path', help='The path of test tree bank.',
+    parser.add_argument('test_path', help=('The path of test tree bank, '
+                                           'bracket text or binary.'),
                         type=str)
     parser.add_argument('result_path', help='The path of result report.',
                         type=str)
 
+    parser.add_argument('-j', '--workers', help='The number of processes.',
+                        type=int, default=1)
+    parser.add_argument('--chunk-size', help=('The number of sentence pairs '
+                                              'sent to a process at a time.'),
+                        type=int, default=500)
+    parser.add_argument('--format', help='The format of result report.',
+                        choices=['markdown', 'tsv', 'csv', 'jsonl'],
+                        default='markdown')
+    parser.add_argument('-p', '--param', help=('The path of the parameter '
+                                               'file, such as COLLINS.prm.'),
+                        type=str, default=None)
+    parser.add_argument('--cutoffs', help=('Report the summary of the '
+                                           'sentences not longer than '
+                                           'each cutoff.'),
+                        type=int, nargs='+', default=[])
+    parser.add_argument('--labels', help='Report the scores of each label.',
+                        action='store_true')
+    parser.add_argument('--confusion', help=('Report the confusion of labels '
+                                             'with the same span.'),
+                        action='store_true')
+    parser.add_argument('--profile', help=('Print the time of each stage '
+                                           'to stderr.'),
+                        action='store_true')
+    parser.add_argument('--profile-json', help=('The path of the time of '
+                                                'each stage in JSON.'),
+                        type=str, default=None)
+    parser.add_argument('--align', help=('Match the sentences by the IDs '
+                                         'before a tab on each line, or by '
+                                         'their words, instead of line by '
+                                         'line.'),
+                        choices=['id', 'words'], default=None)
+    parser.add_argument('--errors', help=('The path of the log of error '
+                                          'sentences.'),
+                        type=str, default=None)
+    parser.add_argument('--gold-cache', help=('The path of the cache of '
+                                              'parsed gold tree bank.'),
+                        type=str, default=None)
+
     args = parser.parse_args()
 
-    scorer = Scorer()
-    scorer.evalb(args.gold_path, args.test_path, args.result_path)
+    # Imported after the arguments are parsed, so --help and
+    # the usage errors do not pay for them.
+    from PYEVALB.binary import BinaryTreebank
+    from PYEVALB.binary import is_binary
+    from PYEVALB.config import Config
+    from PYEVALB.scorer import Scorer
+    from PYEVALB.treebank import Treebank
+
+    gold = args.gold_path
+    test = args.test_path
+    if is_binary(gold):
+        gold = BinaryTreebank(gold)
+    elif args.gold_cache is not None:
+        gold = Treebank.load(gold, cache_path=args.gold_cache)
+    if is_binary(test):
+        test = BinaryTreebank(test)
+
+    config = None
+    if args.param is not None:
+        config = Config.load(args.param)
+    profile = None
+    if args.profile or args.profile_json is not None:
+        from PYEVALB.instrument import Profile
+        profile = Profile()
+    scorer = Scorer(labels=args.labels, confusion=args.confusion,
+                    config=config, buckets=args.cutoffs, profile=profile)
+    scorer.evalb(gold, test, args.result_path,
+                 workers=args.workers, chunk_size=args.chunk_size,
+                 fmt=args.format, error_path=args.errors,
+                 align=args.align)
+
+    if args.profile:
+        print(profile.format(), file=sys.stderr)
+    if args.profile_json is not None:
+        profile.write_json(args.profile_json)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,84 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 16:02:17
+# Last modified: 2026-10-18 16:02:17
+
+"""
+Scoring from async iterators.
+
+The async generators need Python 3.7 or later, so this module is
+only imported by Scorer.ascore_corpus, and the other modules still
+work on older versions:
+
+    async for result in scorer.ascore_corpus(gold, test):
+        ...
+"""
+
+import asyncio
+import collections
+
+from .scorer import _score_chunk
+
+
+async def ascore_corpus(scorer, gold_aiter, test_aiter, batch_size=100,
+                        executor=None, max_pending=2):
+    """The same as Scorer.ascore_corpus.
+    """
+    loop = asyncio.get_running_loop()
+    gold_aiter = _aiter(gold_aiter)
+    test_aiter = _aiter(test_aiter)
+    pending = collections.deque()
+    start = 0
+    try:
+        while True:
+            chunk = await _read_pairs(gold_aiter, test_aiter, batch_size)
+            if len(chunk) != 0:
+                pending.append(loop.run_in_executor(
+                    executor, _score_chunk, (scorer, chunk, start)))
+                start += len(chunk)
+            while len(pending) != 0 and (len(chunk) == 0 or
+                                         len(pending) >= max_pending):
+                results, _ = scorer._collect(await pending.popleft())
+                for result in results:
+                    yield result
+            if len(chunk) == 0:
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+async def _aiter(iterable):
+    """Turn a plain iterator into a async iterator.
+    """
+    if hasattr(iterable, '__aiter__'):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+async def _read_pairs(gold_aiter, test_aiter, size):
+    """Read at most size pairs, stop when any iterator ends.
+    """
+    pairs = []
+    while len(pairs) < size:
+        try:
+            gold = await gold_aiter.__anext__()
+            test = await test_aiter.__anext__()
+        except StopAsyncIteration:
+            break
+        pairs.append((gold, test))
+    return pairs
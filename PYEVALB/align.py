@@ -0,0 +1,147 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 23:26:40
+# Last modified: 2026-10-18 23:26:40
+
+"""
+Alignment of gold and test treebanks with missing or extra sentences.
+
+The sentences are not paired line by line, but by a key:
+
+    id: each line starts with the ID of the sentence and a tab,
+        such as "s12<TAB>(S (NP ...))"
+    words: the sequence of the words of the sentence
+
+The test sentences are put into a hash index by their keys, then the
+gold sentences take the test sentences with the same keys in order,
+so the alignment is linear in the size of the treebanks. The words
+of a bracket string are read without parsing it.
+
+    alignment = Alignment(gold_lines, test_lines, key='id')
+    for result in scorer.iter_aligned(alignment):
+        ...
+    alignment.inserted      # the errors of the extra test sentences
+
+A gold sentence without test sentence is scored as an error sentence
+of kind 'missing', and a test sentence without gold sentence is
+recorded as an ErrorRecord of kind 'inserted'. The ID of an inserted
+sentence is "test:" and its position in the test treebank, so it is
+not confused with the IDs of gold sentences.
+"""
+
+import collections
+import re
+
+from .parser import ParsingError
+from .scorer import MissingSentence
+from .summary import ErrorRecord
+
+KEYS = ['id', 'words']
+
+# A word is the token before a closing bracket.
+_WORD = re.compile(r'([^\s()]+)\s*\)')
+
+
+class Alignment:
+    """The aligned pairs of gold and test sentences.
+
+    Iterating the alignment yields the pairs (gold, test) in the order
+    of the gold treebank, the test item of a missing sentence is an
+    instance of MissingSentence. It can only be iterated once.
+
+    Attributes:
+        key: the key of the sentences, id or words
+        inserted: a list of instances of ErrorRecord of the test
+                  sentences without gold sentence, it is filled
+                  when all the pairs are iterated
+    """
+    def __init__(self, f_gold, f_test, key='words'):
+        """Construct a new alignment.
+
+        Args:
+            f_gold: a iterator of gold treebank, the items can be
+                    bracket strings or parsed trees when the key
+                    is words
+            f_test: a iterator of test treebank, the same as f_gold
+            key: id or words
+        """
+        if key not in KEYS:
+            raise ValueError('Unknown key: ' + str(key))
+        self.key = key
+        self.inserted = []
+        self._f_gold = f_gold
+        self._f_test = f_test
+
+    def __iter__(self):
+        split = _split_id if self.key == 'id' else _split_words
+
+        # The test items of each key, in the order of the test treebank
+        index = collections.defaultdict(collections.deque)
+        for position, item in enumerate(self._f_test):
+            if isinstance(item, str) and len(item.strip()) == 0:
+                continue
+            name, item = split(item)
+            index[name].append((position, item))
+
+        for item in self._f_gold:
+            name, item = split(item)
+            if name is None:
+                # The gold item is broken, it fails by itself.
+                yield item, item
+                continue
+            tests = index.get(name)
+            if tests:
+                yield item, tests.popleft()[1]
+            else:
+                yield item, MissingSentence(self._describe(name))
+
+        inserted = [(position, name) for name, tests in index.items()
+                    for position, _ in tests]
+        inserted.sort(key=lambda v: v[0])
+        self.inserted = [ErrorRecord('test:{0}'.format(position), 'inserted',
+                                     self._describe(name))
+                         for position, name in inserted]
+
+    def _describe(self, name):
+        if name is None:
+            return 'broken sentence'
+        elif self.key == 'id':
+            return 'sentence ID ' + name
+        return 'sentence of {0} words'.format(name.count(' ') + 1)
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _split_id(item):
+    """Return the ID and the bracket string of a line.
+    """
+    if not isinstance(item, str):
+        raise ValueError('The sentences aligned by id must be '
+                         'bracket strings.')
+    name, tab, bracket = item.partition('\t')
+    if len(tab) == 0:
+        return None, ParsingError('No sentence ID !')
+    return name.strip(), bracket
+
+
+def _split_words(item):
+    """Return the words joined by spaces and the item.
+    """
+    if isinstance(item, str):
+        words = _WORD.findall(item)
+    elif isinstance(item, Exception):
+        return None, item
+    else:
+        words = item.sentence
+    if len(words) == 0:
+        return None, item
+    return ' '.join(words), item
@@ -0,0 +1,270 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 15:52:14
+# Last modified: 2026-10-18 15:52:14
+
+"""
+Score many sentences at once with NumPy.
+
+The sentences are flattened into arrays, and the statistics of the
+whole batch are computed by sorting and merging the arrays instead
+of looping over the sentences:
+
+    gold = batch.extract(gold_trees)
+    test = batch.extract(test_trees)
+    statistics, summary = batch.score_batch(gold, test)
+
+All the sentences in a batch are scored as valid sentences, the
+gold and test sentences must have the same words. This module
+needs NumPy (pip install PYEVALB[numpy]).
+"""
+
+import collections
+
+import numpy as np
+
+from .tree import CompactTree
+from .tree import label_id
+from . import summary
+
+# The brackets and tags of a batch of sentences.
+#   sentence, label, start, end: one item for each bracket
+#   tags: the tag ids of all the words
+#   lengths: the number of words of each sentence
+Batch = collections.namedtuple(
+        'Batch', ['sentence', 'label', 'start', 'end', 'tags', 'lengths'])
+
+# The statistics of each sentence, each field is an array.
+Statistics = collections.namedtuple(
+        'Statistics', ['matched_brackets', 'gold_brackets', 'test_brackets',
+                       'cross_brackets', 'words', 'correct_tags'])
+
+
+def extract(trees):
+    """Flatten the trees into a batch.
+
+    Args:
+        trees: a list of instances of Tree or CompactTree
+
+    Returns:
+        An instance of Batch.
+    """
+    trees = [tree if isinstance(tree, CompactTree)
+             else CompactTree.from_tree(tree) for tree in trees]
+    counts = np.array([len(tree.labels) for tree in trees], dtype=np.int64)
+    lengths = np.array([len(tree.sentence) for tree in trees],
+                       dtype=np.int64)
+
+    def concatenate(name):
+        arrays = [np.frombuffer(getattr(tree, name), dtype=np.intc)
+                  for tree in trees if len(getattr(tree, name)) != 0]
+        if len(arrays) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(arrays).astype(np.int64)
+
+    tags = [label_id(tag) for tree in trees for tag in tree.poss]
+    return Batch(np.repeat(np.arange(len(trees)), counts),
+                 concatenate('labels'),
+                 concatenate('starts'),
+                 concatenate('ends'),
+                 np.array(tags, dtype=np.int64),
+                 lengths)
+
+
+def score_batch(gold, test):
+    """Score a batch of sentences.
+
+    Args:
+        gold: the Batch of gold sentences
+        test: the Batch of test sentences
+
+    Returns:
+        a tuple (statistics, summary):
+            statistics: an instance of Statistics
+            summary: the same Summary as summary.summary
+    """
+    n = len(gold.lengths)
+    if len(test.lengths) != n:
+        raise ValueError('The batches have different numbers of sentences.')
+    if not np.array_equal(gold.lengths, test.lengths):
+        ids = np.flatnonzero(gold.lengths != test.lengths)
+        raise ValueError('The lengths of sentences {0} are '
+                         'unmatched.'.format(ids.tolist()))
+
+    gold_keys, test_keys = _keys(gold, test)
+
+    # Matched brackets, duplicated brackets are counted once
+    # as in Scorer._cal_spans.
+    gold_order = np.argsort(gold_keys, kind='stable')
+    gold_first = _first_of_runs(gold_keys[gold_order])
+    test_unique = _unique(test_keys)
+    gold_unique = gold_keys[gold_order][gold_first]
+    in_test = _contains(test_unique, gold_unique)
+    common = gold_unique[in_test]
+    matched = np.bincount(gold.sentence[gold_order[gold_first][in_test]],
+                          minlength=n)
+
+    gold_brackets = np.bincount(gold.sentence, minlength=n)
+    test_brackets = np.bincount(test.sentence, minlength=n)
+
+    unmatched = ~_contains(common, test_keys)
+    cross = _count_crossing(gold, test, unmatched, n)
+
+    # Tags
+    word_sentence = np.repeat(np.arange(n), gold.lengths)
+    correct = np.bincount(word_sentence, weights=(gold.tags == test.tags),
+                          minlength=n).astype(np.int64)
+
+    statistics = Statistics(matched, gold_brackets, test_brackets,
+                            cross, gold.lengths, correct)
+    return statistics, _summary(statistics)
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _keys(gold, test):
+    """Give every (sentence, label, start, end) an integer key.
+    """
+    columns = [np.concatenate([getattr(gold, name), getattr(test, name)])
+               for name in ['sentence', 'label', 'start', 'end']]
+    if len(columns[0]) == 0:
+        return columns[0][:0], columns[0][:0]
+
+    bits = [int(v.max()).bit_length() for v in columns]
+    if sum(bits) <= 62:
+        keys = columns[0]
+        for bit, column in zip(bits[1:], columns[1:]):
+            keys = (keys << bit) | column
+    else:
+        _, keys = np.unique(np.stack(columns, axis=1), axis=0,
+                            return_inverse=True)
+        keys = keys.reshape(-1)
+    size = len(gold.sentence)
+    return keys[:size], keys[size:]
+
+
+def _first_of_runs(keys):
+    """Return the indices where a run of equal sorted keys begins.
+    """
+    return np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+
+
+def _unique(keys):
+    """Return the sorted distinct keys.
+    """
+    keys = np.sort(keys)
+    return keys[_first_of_runs(keys)]
+
+
+def _contains(sorted_keys, values):
+    """Return a mask of values which are in sorted_keys.
+    """
+    if len(sorted_keys) == 0:
+        return np.zeros(len(values), dtype=bool)
+    index = np.searchsorted(sorted_keys, values)
+    index[index == len(sorted_keys)] = 0
+    return sorted_keys[index] == values
+
+
+def _count_crossing(gold, test, unmatched, n):
+    """Count the unmatched test brackets crossing gold brackets.
+
+    The same as scorer._count_crossing: the positions are shifted
+    by the offsets of sentences, so the brackets of all sentences
+    are in one sequence and never cross each other.
+
+    The lengths only count the words of pos tags, the brackets may
+    also cover the words outside pos tags, so each sentence takes
+    the extent of its brackets.
+    """
+    extents = gold.lengths.copy()
+    np.maximum.at(extents, gold.sentence, gold.end)
+    np.maximum.at(extents, test.sentence, test.end)
+    offsets = np.concatenate([[0], np.cumsum(extents)[:-1]])
+    gs = gold.start + offsets[gold.sentence]
+    ge = gold.end + offsets[gold.sentence]
+    us = (test.start + offsets[test.sentence])[unmatched]
+    ue = (test.end + offsets[test.sentence])[unmatched]
+    crossed = np.zeros(len(us), dtype=bool)
+
+    if len(gs) != 0 and len(us) != 0:
+        # Gold brackets starting inside (us, ue) and ending after ue
+        starts, max_ends = _reduce(gs, ge, np.maximum)
+        lo = np.searchsorted(starts, us, side='right')
+        hi = np.searchsorted(starts, ue, side='left')
+        crossed |= _query(max_ends, np.maximum, lo, hi, -1) > ue
+
+        # Gold brackets ending inside (us, ue) and starting before us
+        ends, min_starts = _reduce(ge, gs, np.minimum)
+        lo = np.searchsorted(ends, us, side='right')
+        hi = np.searchsorted(ends, ue, side='left')
+        crossed |= _query(min_starts, np.minimum, lo, hi,
+                          np.iinfo(np.int64).max) < us
+
+    sentence = test.sentence[unmatched]
+    return np.bincount(sentence[crossed], minlength=n)
+
+
+def _reduce(keys, values, func):
+    """Reduce the values of the same key.
+
+    Returns:
+        the sorted distinct keys, and func over the values of each key
+    """
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    values = values[order]
+    first = _first_of_runs(keys)
+    return keys[first], func.reduceat(values, first)
+
+
+def _query(values, func, lo, hi, empty):
+    """Return func over values[lo:hi] of each query by a sparse table.
+    """
+    table = [values]
+    step = 1
+    while 2 * step <= len(values):
+        prev = table[-1]
+        table.append(func(prev[:-step], prev[step:]))
+        step *= 2
+
+    answer = np.full(len(lo), empty, dtype=np.int64)
+    size = hi - lo
+    level = np.zeros(len(lo), dtype=np.int64)
+    nonzero = size > 0
+    level[nonzero] = np.floor(np.log2(size[nonzero])).astype(np.int64)
+    for k in range(len(table)):
+        mask = nonzero & (level == k)
+        if not mask.any():
+            continue
+        a = table[k][lo[mask]]
+        b = table[k][hi[mask] - (1 << k)]
+        answer[mask] = func(a, b)
+    return answer
+
+
+def _summary(statistics):
+    """Sum up the statistics into Summary.
+    """
+    accumulator = summary.Accumulator()
+    n = len(statistics.words)
+    accumulator.sent_num = n
+    accumulator.valid_sent_num = n
+    for name in ['matched_brackets', 'gold_brackets', 'test_brackets',
+                 'cross_brackets', 'words', 'correct_tags']:
+        setattr(accumulator, name, int(getattr(statistics, name).sum()))
+    accumulator.complete_match = int(np.count_nonzero(
+        (statistics.matched_brackets == statistics.gold_brackets) &
+        (statistics.matched_brackets == statistics.test_brackets)))
+    accumulator.no_crossing = int(np.count_nonzero(
+        statistics.cross_brackets == 0))
+    return accumulator.summary()
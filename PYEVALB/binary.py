@@ -0,0 +1,390 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 14:35:50
+# Last modified: 2026-10-18 14:35:50
+
+"""
+Binary format of parsed treebanks.
+
+The file is loaded by mmap, so any sentence can be read without
+parsing the sentences before it, and the trees can be scored
+directly:
+
+    with BinaryTreebank('gold.bin') as gold:
+        scorer.evalb(gold, 'test.txt', 'result.txt')
+
+Layout, all integers are little endian:
+
+    header: magic(8 bytes) sentences(u64) strings(u64) index(u64)
+    records: one record for each sentence
+        int32: brackets words leaves width
+        int32: labels[brackets] words[words] tags[words] leaves[leaves]
+        int16 or int32 by width:
+            starts[brackets] ends[brackets] parents[brackets]
+            positions[leaves]
+    strings: count(u32), then length(u32) and utf8 bytes of each string
+    index: the offsets of records, sentences+1 u64
+
+labels, words, tags and leaves are ids in the string table. leaves
+are the rare words which are not under a pos tag, and positions are
+their positions in the sentence. The bracket string is rebuilt from
+the spans and parents of labels. A record with width 0 is a sentence
+which can not be parsed.
+
+Convert between bracket text and binary:
+
+    python -m PYEVALB.binary to-binary gold.txt gold.bin
+    python -m PYEVALB.binary to-bracket gold.bin gold.txt
+"""
+
+import argparse
+import array
+import mmap
+import struct
+import sys
+
+from .parser import ParsingError
+from .tree import CompactTree
+from .tree import Node
+from .tree import Tree
+from .tree import label_id
+from .tree import label_name
+from . import parser
+
+MAGIC = b'PYEVALB\x01'
+_HEADER = struct.Struct('<8sQQQ')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_RECORD_HEADER = struct.Struct('<iiii')
+
+_SWAP = sys.byteorder != 'little'
+
+
+def is_binary(path):
+    """Return True if the file is a binary treebank.
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary(lines, path):
+    """Parse the bracket strings and write them into a binary treebank.
+
+    Args:
+        lines: a iterator of bracket strings
+        path: the path of the binary treebank
+
+    Returns:
+        the number of sentences.
+    """
+    strings = dict()
+    # The strings in the order of their ids, the order of a dict
+    # is arbitrary before Python 3.6.
+    names = []
+    offsets = array.array('Q')
+
+    def string_id(value):
+        try:
+            return strings[value]
+        except KeyError:
+            strings[value] = len(names)
+            names.append(value)
+            return strings[value]
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0, 0))
+        for line in lines:
+            offsets.append(f.tell())
+            try:
+                root = parser._create_root(line)
+            except ParsingError:
+                records = [array.array('i', [0, 0, 0, 0])]
+            else:
+                records = _make_record(root, string_id)
+            for record in records:
+                if _SWAP:
+                    record.byteswap()
+                f.write(record.tobytes())
+        strings_offset = f.tell()
+        offsets.append(strings_offset)
+
+        f.write(_U32.pack(len(names)))
+        for value in names:
+            data = value.encode('utf8')
+            f.write(_U32.pack(len(data)))
+            f.write(data)
+
+        index_offset = f.tell()
+        if _SWAP:
+            offsets.byteswap()
+        f.write(offsets.tobytes())
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, len(offsets) - 1,
+                             strings_offset, index_offset))
+    return len(offsets) - 1
+
+
+def convert(bracket_path, binary_path):
+    """Convert a bracket treebank into a binary treebank.
+    """
+    with open(bracket_path, encoding='utf8') as f:
+        return write_binary(f, binary_path)
+
+
+def to_bracket(binary_path, bracket_path):
+    """Convert a binary treebank back into a bracket treebank.
+
+    The sentences which can not be parsed become empty lines.
+    """
+    with BinaryTreebank(binary_path) as treebank, \
+            open(bracket_path, 'w', encoding='utf8') as f:
+        for i in range(len(treebank)):
+            try:
+                f.write(str(treebank.to_tree(i)))
+            except ParsingError:
+                pass
+            f.write('\n')
+
+
+class BinaryTreebank:
+    """A binary treebank loaded by mmap.
+
+    Each item is an instance of CompactTree, or the ParsingError
+    of the sentence which can not be parsed, the same as Treebank.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0,
+                             access=mmap.ACCESS_READ)
+        magic, self._size, strings_offset, self._index = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(path + ' is not a binary treebank.')
+
+        # The string table
+        self._strings = []
+        (count,) = _U32.unpack_from(self._mm, strings_offset)
+        offset = strings_offset + _U32.size
+        for _ in range(count):
+            (length,) = _U32.unpack_from(self._mm, offset)
+            offset += _U32.size
+            value = self._mm[offset:offset+length].decode('utf8')
+            self._strings.append(sys.intern(value))
+            offset += length
+        # The label ids of strings, filled when needed.
+        self._label_ids = dict()
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def _record(self, index):
+        """Read the record of the sentence.
+
+        Returns:
+            a tuple (ids, positions):
+                ids: the int32 header and string ids
+                positions: the starts, ends, parents and positions
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('sentence index out of range')
+        offset = self._index + index * _U64.size
+        start, end = struct.unpack_from('<QQ', self._mm, offset)
+        brackets, words, leaves, width = _RECORD_HEADER.unpack_from(
+                self._mm, start)
+        if width == 0:
+            raise ParsingError('Sentence {0} can not be parsed !'.format(
+                index))
+
+        middle = start + (4 + brackets + 2 * words + leaves) * 4
+        ids = array.array('i')
+        ids.frombytes(self._mm[start:middle])
+        positions = array.array('h' if width == 2 else 'i')
+        positions.frombytes(self._mm[middle:end])
+        if _SWAP:
+            ids.byteswap()
+            positions.byteswap()
+        return ids, positions
+
+    def _label_id(self, value):
+        try:
+            return self._label_ids[value]
+        except KeyError:
+            return self._label_ids.setdefault(
+                    value, label_id(self._strings[value]))
+
+    def tree(self, index):
+        """Return the CompactTree of the sentence.
+
+        Raises:
+            ParsingError: if the sentence can not be parsed.
+        """
+        ids, positions = self._record(index)
+        brackets, words = ids[0], ids[1]
+        strings = self._strings
+
+        i = 4
+        labels = array.array('i', map(self._label_id,
+                                      ids[i:i+brackets]))
+        i += brackets
+        sentence = tuple([strings[v] for v in ids[i:i+words]])
+        i += words
+        poss = tuple([strings[v] for v in ids[i:i+words]])
+
+        starts = array.array('i', positions[:brackets])
+        ends = array.array('i', positions[brackets:2*brackets])
+        parents = array.array('i', positions[2*brackets:3*brackets])
+        return CompactTree.from_arrays(labels, starts, ends, parents,
+                                       sentence, poss)
+
+    def to_tree(self, index):
+        """Rebuild the Tree of the sentence.
+
+        The label nodes are visited in DFS order, which is also the
+        order of their starts. Each word is added to the deepest
+        label node which is open at its position.
+
+        Raises:
+            ParsingError: if the sentence can not be parsed.
+        """
+        ids, positions = self._record(index)
+        brackets, words, leaves = ids[0], ids[1], ids[2]
+        strings = self._strings
+
+        i = 4
+        labels = ids[i:i+brackets]
+        i += brackets
+        sentence = ids[i:i+words]
+        i += words
+        poss = ids[i:i+words]
+        i += words
+        leaf_values = ids[i:i+leaves]
+        starts = positions[:brackets]
+        ends = positions[brackets:2*brackets]
+        parents = positions[2*brackets:3*brackets]
+        leaf_positions = dict(zip(positions[3*brackets:], leaf_values))
+
+        # The terminal nodes at each position
+        terminals = []
+        pairs = zip(sentence, poss)
+        for p in range(len(sentence) + leaves):
+            if p in leaf_positions:
+                terminals.append(Node(strings[leaf_positions[p]]))
+            else:
+                word, pos = next(pairs)
+                terminals.append(Node(strings[pos], [Node(strings[word])]))
+
+        if brackets == 0:
+            return Tree(terminals[0])
+
+        nodes = [Node(strings[v]) for v in labels]
+        # Each item is the index of an open label node
+        stack = []
+        p = 0
+        for j in range(brackets + 1):
+            # The terminals before the start of label node j
+            start = starts[j] if j < brackets else len(terminals)
+            while p < start:
+                while ends[stack[-1]] <= p:
+                    stack.pop()
+                nodes[stack[-1]].children.append(terminals[p])
+                p += 1
+            if j < brackets:
+                while len(stack) != 0 and stack[-1] != parents[j]:
+                    stack.pop()
+                if len(stack) != 0:
+                    nodes[stack[-1]].children.append(nodes[j])
+                stack.append(j)
+        return Tree(nodes[0])
+
+    def __getitem__(self, index):
+        try:
+            return self.tree(index)
+        except ParsingError as e:
+            return e
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __len__(self):
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _make_record(root, string_id):
+    """Encode the tree of root into the arrays of a record.
+    """
+    tree = CompactTree(root)
+    brackets = len(tree.labels)
+
+    leaf_values = []
+    leaf_positions = []
+    length = tree.ends[0] if brackets != 0 else 1
+    if length != len(tree.sentence):
+        # Find the words which are not under a pos tag.
+        p = 0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.isLeaf():
+                leaf_values.append(string_id(node.value))
+                leaf_positions.append(p)
+                p += 1
+            elif node.isPos():
+                p += 1
+            else:
+                stack.extend(reversed(node.children))
+
+    width = 2 if length < 2**15 and brackets < 2**15 else 4
+    ids = array.array('i', [brackets, len(tree.sentence),
+                            len(leaf_values), width])
+    ids.extend([string_id(label_name(v)) for v in tree.labels])
+    ids.extend([string_id(v) for v in tree.sentence])
+    ids.extend([string_id(v) for v in tree.poss])
+    ids.extend(leaf_values)
+
+    positions = array.array('h' if width == 2 else 'i', tree.starts)
+    positions.fromlist(tree.ends.tolist())
+    positions.fromlist(tree.parents.tolist())
+    positions.fromlist(leaf_positions)
+    return ids, positions
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('command', choices=['to-binary', 'to-bracket'])
+    args.add_argument('input_path', help='The path of input tree bank.',
+                      type=str)
+    args.add_argument('output_path', help='The path of output tree bank.',
+                      type=str)
+    args = args.parse_args()
+
+    if args.command == 'to-binary':
+        convert(args.input_path, args.output_path)
+    else:
+        to_bracket(args.input_path, args.output_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 20:41:03
+# Last modified: 2026-10-18 20:41:03
+
+"""
+The parameter files of Evalb.
+
+A parameter file has one setting on each line, the lines starting
+with # are comments:
+
+    CUTOFF_LEN 40
+    LABELED 1
+    DELETE_LABEL TOP
+    DELETE_LABEL -NONE-
+    DELETE_LABEL ,
+    DELETE_LABEL_FOR_LENGTH -NONE-
+    EQ_LABEL ADVP PRT
+
+DELETE_LABEL: the brackets of the label are ignored, their children
+    are kept. If the label is a pos tag, the word is deleted from the
+    sentence too.
+DELETE_LABEL_FOR_LENGTH: the words of the pos tag are not counted
+    in the length of the sentence.
+EQ_LABEL: the labels are treated as the same label.
+CUTOFF_LEN: the summary of the sentences not longer than it is
+    reported besides the summary of all the sentences.
+LABELED: 0 means that the labels of brackets are ignored.
+
+The other settings of Evalb, such as DEBUG and MAX_ERROR, are read
+but not used. The settings are compiled into the sets and maps of
+label ids, which are applied while the brackets are collected:
+
+    config = Config.load('COLLINS.prm')
+    scorer = Scorer(config=config)
+"""
+
+from .tree import label_id
+from .tree import label_name
+
+# The label of all the brackets when LABELED is 0.
+UNLABELED = '*'
+
+# The label id of deleted labels.
+DELETED = -1
+
+
+class Config:
+    """The compiled settings of scoring.
+
+    Attributes:
+        delete_labels: frozenset - The labels to delete.
+        delete_labels_for_length: frozenset - The pos tags which are
+                                  not counted in the length.
+        eq_labels: list - The groups of equivalent labels.
+        cutoff_len: int - The cutoff of the length, or None.
+        labeled: bool - False means the labels are ignored.
+    """
+    def __init__(self, delete_labels=(), delete_labels_for_length=(),
+                 eq_labels=(), cutoff_len=None, labeled=True):
+        self.delete_labels = frozenset(delete_labels)
+        self.delete_labels_for_length = frozenset(delete_labels_for_length)
+        self.eq_labels = [tuple(group) for group in eq_labels]
+        self.cutoff_len = cutoff_len
+        self.labeled = labeled
+        self._compile()
+
+    def _compile(self):
+        """Build the maps from labels to the ids of brackets.
+
+        The labels which are not in the settings are mapped
+        when they are seen for the first time.
+        """
+        self._names = dict()
+        for group in self.eq_labels:
+            for label in group:
+                self._names[label] = group[0]
+        for label in self.delete_labels:
+            self._names[label] = None
+        # The maps from label names and label ids to bracket label ids
+        self._ids_by_name = dict()
+        self._ids_by_id = dict()
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Read the settings from the lines of a parameter file.
+
+        Raises:
+            ValueError: if a setting has bad arguments.
+        """
+        delete_labels = []
+        delete_labels_for_length = []
+        eq_labels = []
+        cutoff_len = None
+        labeled = True
+        for number, line in enumerate(lines, 1):
+            items = line.split()
+            if len(items) == 0 or items[0].startswith('#'):
+                continue
+            name, args = items[0], items[1:]
+            if name in ('DELETE_LABEL', 'DELETE_LABEL_FOR_LENGTH',
+                        'CUTOFF_LEN', 'LABELED') and len(args) != 1:
+                raise ValueError('Line {0}: {1} needs one argument.'.format(
+                    number, name))
+            if name == 'DELETE_LABEL':
+                delete_labels.append(args[0])
+            elif name == 'DELETE_LABEL_FOR_LENGTH':
+                delete_labels_for_length.append(args[0])
+            elif name == 'EQ_LABEL':
+                if len(args) < 2:
+                    raise ValueError('Line {0}: EQ_LABEL needs two labels '
+                                     'at least.'.format(number))
+                eq_labels.append(args)
+            elif name == 'CUTOFF_LEN':
+                cutoff_len = _int(args[0], number)
+            elif name == 'LABELED':
+                labeled = _int(args[0], number) != 0
+        return cls(delete_labels, delete_labels_for_length, eq_labels,
+                   cutoff_len, labeled)
+
+    @classmethod
+    def load(cls, path):
+        """Read a parameter file.
+        """
+        with open(path, encoding='utf8') as f:
+            return cls.from_lines(f)
+
+    def label(self, name):
+        """Return the bracket label id of the label, DELETED if
+        the brackets of the label are deleted.
+        """
+        try:
+            return self._ids_by_name[name]
+        except KeyError:
+            pass
+        canonical = self._names.get(name, name)
+        if canonical is None:
+            value = DELETED
+        elif not self.labeled:
+            value = label_id(UNLABELED)
+        else:
+            value = label_id(canonical)
+        self._ids_by_name[name] = value
+        return value
+
+    def label_of_id(self, label):
+        """The same as label, but takes the label id.
+        """
+        try:
+            return self._ids_by_id[label]
+        except KeyError:
+            value = self.label(label_name(label))
+            self._ids_by_id[label] = value
+            return value
+
+    def length(self, poss):
+        """Return the length of the sentence with the pos tags.
+        """
+        if len(self.delete_labels_for_length) == 0:
+            return len(poss)
+        deleted = self.delete_labels_for_length
+        return sum(1 for pos in poss if pos not in deleted)
+
+    def __getstate__(self):
+        # The label ids are only valid in current process.
+        return (self.delete_labels, self.delete_labels_for_length,
+                self.eq_labels, self.cutoff_len, self.labeled)
+
+    def __setstate__(self, state):
+        (self.delete_labels, self.delete_labels_for_length,
+         self.eq_labels, self.cutoff_len, self.labeled) = state
+        self._compile()
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _int(value, number):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError('Line {0}: {1} is not an integer.'.format(
+            number, value))
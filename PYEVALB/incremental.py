@@ -0,0 +1,145 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 18:47:09
+# Last modified: 2026-10-18 18:47:09
+
+"""
+Incremental evaluation of a changing test treebank.
+
+The result of each sentence is kept with the hash of its gold and
+test bracket strings. When the treebanks are scored again, only the
+sentences whose strings changed are parsed and scored, and the
+corpus counters are updated by removing the old results and adding
+the new ones:
+
+    evaluation = IncrementalScorer()
+    evaluation.update(gold_lines, test_lines)
+    ...  # edit some test sentences
+    evaluation.update(gold_lines, test_lines)
+    print(evaluation.summary())
+"""
+
+import hashlib
+
+from .scorer import Scorer
+from . import report
+from . import summary
+
+
+class IncrementalScorer:
+    """The scores of a corpus which can be updated sentence by sentence.
+
+    The items of the treebanks must be bracket strings.
+    """
+    def __init__(self, scorer=None):
+        """Construct a new incremental scorer.
+
+        Args:
+            scorer: the instance of Scorer, a new one by default.
+        """
+        self.scorer = Scorer() if scorer is None else scorer
+        # The (digest, result) of each sentence
+        self._entries = []
+        self._accumulator = summary.Accumulator()
+
+    def update(self, f_gold, f_test):
+        """Score the treebanks again, only the changed sentences
+        are scored.
+
+        Args:
+            f_gold: a iterator of gold bracket strings
+            f_test: a iterator of test bracket strings
+
+        Returns:
+            the number of sentences which are scored.
+        """
+        scored = 0
+        size = 0
+        for ID, (gold, test) in enumerate(zip(f_gold, f_test)):
+            size += 1
+            if self._set(ID, gold, test):
+                scored += 1
+        while len(self._entries) > size:
+            _, result = self._entries.pop()
+            self._accumulator.remove(result)
+        return scored
+
+    def update_sentence(self, ID, gold, test):
+        """Score one sentence again if its strings changed.
+
+        Args:
+            ID: the ID of the sentence, it can be the ID
+                after the last sentence to append a sentence.
+            gold: the gold bracket string
+            test: the test bracket string
+
+        Returns:
+            True if the sentence is scored.
+        """
+        if not 0 <= ID <= len(self._entries):
+            raise IndexError('sentence ID out of range')
+        return self._set(ID, gold, test)
+
+    def _set(self, ID, gold, test):
+        digest = _digest(gold, test)
+        if ID < len(self._entries):
+            old_digest, old_result = self._entries[ID]
+            if old_digest == digest:
+                return False
+            self._accumulator.remove(old_result)
+        else:
+            self._entries.append(None)
+
+        result = next(self.scorer._iter_pairs([(gold, test)], ID))
+        self._accumulator.add(result)
+        self._entries[ID] = (digest, result)
+        return True
+
+    @property
+    def results(self):
+        """The list of Result of each sentence.
+        """
+        return [result for _, result in self._entries]
+
+    def summary(self):
+        return self._accumulator.summary()
+
+    def evalb(self, gold_path, test_path, result_path, fmt='markdown'):
+        """Update the scores from the treebank files and write the report.
+
+        Returns:
+            An instance of Summary.
+        """
+        with open(gold_path, encoding='utf8') as f_gold, \
+                open(test_path, encoding='utf8') as f_test:
+            self.update(f_gold, f_test)
+
+        s = self.summary()
+        with open(result_path, 'w', encoding='utf8') as f:
+            writer = report.get_writer(fmt, f)
+            writer.write_header()
+            for _, result in self._entries:
+                writer.write_row(result)
+            writer.write_summary(s)
+        return s
+
+    def __len__(self):
+        return len(self._entries)
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _digest(gold, test):
+    h = hashlib.sha1(gold.encode('utf8'))
+    h.update(b'\0')
+    h.update(test.encode('utf8'))
+    return h.digest()
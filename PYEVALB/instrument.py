@@ -0,0 +1,171 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 22:03:44
+# Last modified: 2026-10-18 22:03:44
+
+"""
+Timing of the stages of scoring.
+
+The profile is opt-in, the scorer only times its stages when it has
+a profile, so there is no cost otherwise:
+
+    profile = instrument.Profile()
+    scorer = Scorer(profile=profile)
+    scorer.evalb(gold_path, test_path, result_path)
+    print(profile.format())
+    profile.write_json('profile.json')
+
+Stages:
+    parse: bracket strings into nodes
+    build: nodes into trees
+    match: matching the brackets and tags of two trees
+    write: writing the report
+
+With worker processes, the stage times are summed over the
+processes, so they can be longer than the elapsed time.
+"""
+
+import collections
+import json
+import sys
+import time
+
+STAGES = ['parse', 'build', 'match', 'write']
+
+
+class Profile:
+    """The cumulative wall time and calls of each stage.
+
+    Attributes:
+        stages: a dict from stage names to the lists [calls, seconds]
+        sentences: the number of scored sentences
+        tokens: the number of words of scored sentences
+        elapsed: the wall time between start and stop
+    """
+    def __init__(self):
+        self.stages = collections.OrderedDict(
+                (name, [0, 0.0]) for name in STAGES)
+        self.sentences = 0
+        self.tokens = 0
+        self.elapsed = 0.0
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        if self._start is not None:
+            self.elapsed += time.perf_counter() - self._start
+            self._start = None
+
+    def add(self, stage, seconds, calls=1):
+        """Add the time of calls of the stage.
+        """
+        if stage not in self.stages:
+            self.stages[stage] = [0, 0.0]
+        counter = self.stages[stage]
+        counter[0] += calls
+        counter[1] += seconds
+
+    def merge(self, other):
+        """Add the stages and counts of another profile, such as
+        the profile of a worker process.
+        """
+        for stage, (calls, seconds) in other.stages.items():
+            self.add(stage, seconds, calls)
+        self.sentences += other.sentences
+        self.tokens += other.tokens
+
+    def stats(self):
+        """Return the statistics as a dict which can be dumped to JSON.
+        """
+        elapsed = self.elapsed
+        stages = collections.OrderedDict()
+        for stage, (calls, seconds) in self.stages.items():
+            stages[stage] = {
+                    'calls': calls,
+                    'seconds': seconds,
+                    'percent': _ratio(seconds, elapsed) * 100,
+                    }
+        return collections.OrderedDict([
+            ('elapsed', elapsed),
+            ('sentences', self.sentences),
+            ('tokens', self.tokens),
+            ('sentences_per_sec', _ratio(self.sentences, elapsed)),
+            ('tokens_per_sec', _ratio(self.tokens, elapsed)),
+            ('peak_rss_mb', peak_rss_mb()),
+            ('stages', stages),
+            ])
+
+    def format(self):
+        """Return the statistics as a block of text.
+        """
+        stats = self.stats()
+        lines = ['=' * 50, 'Profile', '=' * 50]
+        lines.append('Elapsed:\t{0:.3f} s'.format(stats['elapsed']))
+        lines.append('Sentences:\t{0} ({1:.1f}/s)'.format(
+            stats['sentences'], stats['sentences_per_sec']))
+        lines.append('Tokens:\t{0} ({1:.1f}/s)'.format(
+            stats['tokens'], stats['tokens_per_sec']))
+        if stats['peak_rss_mb'] is not None:
+            lines.append('Peak memory:\t{0:.1f} MB'.format(
+                stats['peak_rss_mb']))
+        for stage, value in stats['stages'].items():
+            lines.append('{0}:\t{1:.3f} s\t{2} calls\t{3:.1f}%'.format(
+                stage, value['seconds'], value['calls'], value['percent']))
+        return '\n'.join(lines)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf8') as f:
+            json.dump(self.stats(), f, indent=2)
+            f.write('\n')
+
+
+class TimedWriter:
+    """A report writer which adds its time to the write stage.
+    """
+    def __init__(self, writer, profile):
+        self._writer = writer
+        self._profile = profile
+
+    def __getattr__(self, name):
+        method = getattr(self._writer, name)
+        profile = self._profile
+
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return method(*args)
+            finally:
+                profile.add('write', time.perf_counter() - start)
+        return timed
+
+
+def peak_rss_mb():
+    """Return the peak resident memory of current process in MB,
+    None if it is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes on the others.
+    if sys.platform == 'darwin':
+        return peak / 2**20
+    return peak / 2**10
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _ratio(a, b):
+    return a / b if b != 0 else 0
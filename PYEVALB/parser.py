@@ -19,8 +19,6 @@ Create tree structures from string.
 
 """
 
-import collections
-
 from .tree import Node
 from .tree import Tree
 
@@ -36,7 +34,17 @@ class ParsingError(Exception):
 def create_from_bracket_string(line):
     """Create tree structure from a given string.
     """
-    stack = collections.deque()
+    return Tree(_create_root(line))
+
+
+def _create_root(line):
+    """Build the nodes of a bracket string and return the root.
+
+    Every '(' opens a new frame, which collects the label and the
+    children of a node until the matching ')'. So closing a bracket
+    only turns the current frame into a node, and the common cases
+    are decided by the length of the frame.
+    """
     if len(line.strip()) == 0:
         raise ParsingError('Empty String !')
 
@@ -44,44 +52,78 @@ def create_from_bracket_string(line):
     sentence = line.replace('(', ' ( ')
     sentence = sentence.replace(')', ' ) ')
 
-    sentence = sentence.split()
-    for char in sentence:
-        if char != ')':
-            stack.append(char)
+    # frames[0] holds the items outside of any bracket.
+    frames = [[]]
+    frame = frames[0]
+    for token in sentence.split():
+        if token == '(':
+            frame = []
+            frames.append(frame)
+        elif token != ')':
+            frame.append(token)
+        elif len(frame) == 2 and len(frames) > 1 and type(frame[1]) is str:
+            # (POS word)
+            frames.pop()
+            label = frame[0]
+            if type(label) is str:
+                label = Node(label)
+            label.children = [Node(frame[1])]
+            frame = frames[-1]
+            frame.append(label)
+        elif len(frame) > 1 and len(frames) > 1:
+            frames.pop()
+            frame = _make_node(frame)
+            frames[-1].append(frame)
+            frame = frames[-1]
         else:
-            if type(stack[-1]) == str and stack[-2] == '(':
-                stack.append(char)
-            else:
-                _stack_operation(stack)
-    root = stack.pop()
-    return Tree(root)
+            frame = _stack_operation(frames)
 
+    # The last node is the root, even if some brackets are not closed.
+    root = frame[-1] if len(frame) != 0 else None
+    if type(root) is not Node:
+        raise ParsingError('Unbalanced brackets !')
+    return root
 
-def _stack_operation(stack):
-    """The standard operation on the stack.
 
-    Pop items and insert a new item.
+def _make_node(frame):
+    """Turn the items of a frame into a node.
+    """
+    parent = frame[0]
+    if type(parent) is str:
+        parent = Node(parent)
+    parent.children = [Node(value) if type(value) is str else value
+                       for value in frame[1:]]
+    return parent
+
+
+def _stack_operation(frames):
+    """Close the current frame when it has less than two items.
 
     Args:
-        stack
+        frames: a list of frames, each frame is a list of tokens
+                and nodes after a '('
+
+    Returns:
+        The current frame after the operation.
     """
-    if len(stack) == 0:
-        return
-    children = []
-
-    # Special case for '(' or ')' as the content of sentence.
-    value = stack.pop()
-    if type(value) == str:
-        value = Node(value)
-    children.append(value)
-
-    while len(stack) != 0 and stack[-1] != '(':
-        value = stack.pop()
-        if type(value) == str:
-            value = Node(value)
-        children.append(value)
-    parent = children.pop()
-    children.reverse()
-    parent.children = children
-    stack.pop()
-    stack.append(parent)
+    frame = frames[-1]
+    if len(frames) > 1:
+        # Special case for ')' as the content of sentence.
+        if len(frame) == 1 and type(frame[0]) is str:
+            frame.append(')')
+            return frame
+        if len(frame) == 0 and len(frames) > 2 and len(frames[-2]) == 0:
+            frame.append(')')
+            return frame
+
+        # Special case for '(' as the content of sentence.
+        if len(frame) == 0:
+            frames.pop()
+            frame = frames[-1]
+            frame.append('(')
+
+    if len(frames) == 1:
+        raise ParsingError('Unbalanced brackets !')
+    frames.pop()
+    frames[-1].append(_make_node(frame))
+    return frames[-1]
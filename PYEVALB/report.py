@@ -0,0 +1,305 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 10:12:40
+# Last modified: 2026-10-18 10:12:40
+
+"""
+Write the score result row by row.
+
+The writers in this module never hold the whole table in memory,
+every row is written out as soon as the sentence is scored.
+
+Formats:
+    markdown: the markdown table followed by the summary
+    tsv: tab separated rows, the summary follows a blank line
+    csv: comma separated rows, the summary follows a blank line
+    jsonl: one JSON object per row, the last line is the summary
+
+The tables of labels and of the label confusion follow the summary
+when the scorer counts them, and the table of the error kinds follows
+when there are error sentences.
+
+The csv and json modules are imported only by their writers.
+"""
+
+from .summary import LABEL_SUMMARY_TABLE
+from .summary import Result
+from .summary import SUMMARY_TABLE
+from .summary import _summary2string
+
+
+class Writer:
+    """The base class of writers.
+
+    Usage:
+        writer.write_header()
+        for result in results:
+            writer.write_row(result)
+        writer.write_summary(summary)
+        writer.write_labels(label_summary)      # optional
+        writer.write_confusion(confusion)       # optional
+        writer.write_errors(errors)             # optional
+    """
+    def __init__(self, stream):
+        """Construct a new writer.
+
+        Args:
+            stream: file - An opened file object.
+        """
+        self._stream = stream
+
+    def write_header(self):
+        pass
+
+    def write_row(self, result):
+        raise NotImplementedError
+
+    def write_summary(self, summary, name=None):
+        """Write the summary.
+
+        Args:
+            summary: an instance of Summary
+            name: the name of a summary of a part of the sentences,
+                  None for the summary of all the sentences
+        """
+        raise NotImplementedError
+
+    def write_labels(self, label_summary):
+        """Write the scores of labels.
+
+        Args:
+            label_summary: a list of instances of LabelSummary
+        """
+        self._write_rows(LABEL_SUMMARY_TABLE,
+                         [_format_row(v) for v in label_summary])
+
+    def write_confusion(self, confusion):
+        """Write the pairs of gold and test labels with the same span.
+
+        Args:
+            confusion: a dict from (gold label, test label) to count
+        """
+        self._write_rows(CONFUSION_TABLE,
+                         [_format_row(v) for v in _confusion_rows(confusion)])
+
+    def write_errors(self, errors):
+        """Write the number of error sentences of each kind.
+
+        Args:
+            errors: a dict from the kinds of errors to count
+        """
+        self._write_rows(ERROR_COUNT_TABLE,
+                         [_format_row(v) for v in sorted(errors.items())])
+
+    def _write_rows(self, header, rows):
+        raise NotImplementedError
+
+
+class MarkdownWriter(Writer):
+    """Streaming writer of the markdown table.
+
+    The width of each column is fixed by the length of its header,
+    so the rows can be written without looking at the others.
+    """
+    def __init__(self, stream, table_name='Score Result'):
+        """Construct a new writer.
+
+        Args:
+            stream: file - An opened file object.
+            table_name: str - The title of the table.
+        """
+        Writer.__init__(self, stream)
+        self._table_name = table_name
+        self._widths = [len(name) + 2 for name in Result.STATISTICS_TABLE]
+        # The title of the next table written by _write_rows
+        self._title = table_name
+
+    def write_header(self):
+        f = self._stream
+        f.write('# ' + self._table_name + '\n')
+        header = [' ' + name + ' ' for name in Result.STATISTICS_TABLE]
+        f.write('|' + '|'.join(header) + '|\n')
+        aligns = ['-' * (width - 1) + ':' for width in self._widths]
+        f.write('|' + '|'.join(aligns) + '|\n')
+
+    def write_row(self, result):
+        row = [value.rjust(width) for value, width
+               in zip(result.tolist(), self._widths)]
+        self._stream.write('|' + '|'.join(row) + '|\n')
+
+    def write_summary(self, summary, name=None):
+        f = self._stream
+        f.write('\n')
+        f.write('='*145)
+        f.write('\n')
+        if name is not None:
+            f.write('-- ' + name + ' --\n')
+        f.write(_summary2string(summary))
+
+    def write_labels(self, label_summary):
+        self._title = 'Label Result'
+        Writer.write_labels(self, label_summary)
+
+    def write_confusion(self, confusion):
+        self._title = 'Label Confusion'
+        Writer.write_confusion(self, confusion)
+
+    def write_errors(self, errors):
+        self._title = 'Error Result'
+        Writer.write_errors(self, errors)
+
+    def _write_rows(self, header, rows):
+        f = self._stream
+        widths = [len(name) + 2 for name in header]
+        f.write('\n\n# ' + self._title + '\n')
+        f.write('|' + '|'.join(' ' + name + ' ' for name in header) + '|\n')
+        f.write('|' + '|'.join('-' * (width - 1) + ':'
+                               for width in widths) + '|\n')
+        for row in rows:
+            f.write('|' + '|'.join(value.rjust(width) for value, width
+                                   in zip(row, widths)) + '|\n')
+
+
+class TsvWriter(Writer):
+    """Streaming writer of tab separated values.
+    """
+    def write_header(self):
+        self._stream.write('\t'.join(Result.STATISTICS_TABLE) + '\n')
+
+    def write_row(self, result):
+        self._stream.write('\t'.join(result.tolist()) + '\n')
+
+    def write_summary(self, summary, name=None):
+        f = self._stream
+        f.write('\n')
+        if name is not None:
+            f.write('Summary\t' + name + '\n')
+        for title, value in zip(SUMMARY_TABLE, summary):
+            f.write(title + '\t' + '{0:.2f}'.format(value) + '\n')
+
+    def _write_rows(self, header, rows):
+        f = self._stream
+        f.write('\n')
+        f.write('\t'.join(header) + '\n')
+        for row in rows:
+            f.write('\t'.join(row) + '\n')
+
+
+class CsvWriter(Writer):
+    """Streaming writer of comma separated values.
+    """
+    def __init__(self, stream):
+        import csv
+
+        Writer.__init__(self, stream)
+        self._writer = csv.writer(stream, lineterminator='\n')
+
+    def write_header(self):
+        self._writer.writerow(Result.STATISTICS_TABLE)
+
+    def write_row(self, result):
+        self._writer.writerow(result.tolist())
+
+    def write_summary(self, summary, name=None):
+        self._writer.writerow([])
+        if name is not None:
+            self._writer.writerow(['Summary', name])
+        for title, value in zip(SUMMARY_TABLE, summary):
+            self._writer.writerow([title, '{0:.2f}'.format(value)])
+
+    def _write_rows(self, header, rows):
+        self._writer.writerow([])
+        self._writer.writerow(header)
+        self._writer.writerows(rows)
+
+
+class JsonLinesWriter(Writer):
+    """Streaming writer of JSON Lines.
+
+    The values are written as numbers without formatting.
+    """
+    def __init__(self, stream):
+        import json
+
+        Writer.__init__(self, stream)
+        self._dumps = json.dumps
+
+    def write_row(self, result):
+        self._stream.write(self._dumps(result.todict()) + '\n')
+
+    def write_summary(self, summary, name=None):
+        row = {'summary': summary._asdict()}
+        if name is not None:
+            row['name'] = name
+        self._stream.write(self._dumps(row) + '\n')
+
+    def write_labels(self, label_summary):
+        row = {'labels': [v._asdict() for v in label_summary]}
+        self._stream.write(self._dumps(row) + '\n')
+
+    def write_confusion(self, confusion):
+        row = {'confusion': [dict(zip(CONFUSION_TABLE, v))
+                             for v in _confusion_rows(confusion)]}
+        self._stream.write(self._dumps(row) + '\n')
+
+    def write_errors(self, errors):
+        row = {'errors': dict(errors)}
+        self._stream.write(self._dumps(row) + '\n')
+
+
+CONFUSION_TABLE = ['gold_label', 'test_label', 'count']
+
+ERROR_COUNT_TABLE = ['kind', 'count']
+
+WRITERS = {
+        'markdown': MarkdownWriter,
+        'tsv': TsvWriter,
+        'csv': CsvWriter,
+        'jsonl': JsonLinesWriter,
+        }
+
+
+def get_writer(fmt, stream):
+    """Create the writer of the format.
+
+    Args:
+        fmt: str - One of the keys of WRITERS.
+        stream: file - An opened file object.
+    """
+    try:
+        writer = WRITERS[fmt]
+    except KeyError:
+        raise ValueError('Unknown format: ' + str(fmt))
+    return writer(stream)
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _format_row(values):
+    reval = []
+    for value in values:
+        if isinstance(value, str):
+            reval.append(value)
+        elif isinstance(value, int):
+            reval.append('%d' % value)
+        else:
+            reval.append('%.2f' % value)
+    return reval
+
+
+def _confusion_rows(confusion):
+    """Return the rows (gold label, test label, count), the most
+    frequent pairs come first.
+    """
+    rows = [(gold, test, count) for (gold, test), count in confusion.items()]
+    rows.sort(key=lambda v: (-v[2], v[0], v[1]))
+    return rows
@@ -13,9 +13,23 @@
 PYEVALB: Evalb in Python version.
 """
 
+import bisect
+import collections
+import contextlib
+import copy
+import itertools
+import time
+
 from .parser import ParsingError
+from .summary import ErrorRecord
 from .summary import Result
+from .summary import _ratio
+from .tree import CompactTree
+from .tree import POSITION_BITS
+from .tree import Tree
+from .tree import label_name
 from . import parser
+from . import report
 from . import summary
 
 ############################################################
@@ -24,15 +38,33 @@ from . import summary
 
 
 class ScoreException(Exception):
+    """The base class of the errors of sentence pairs.
+
+    Attributes:
+        kind: the kind of the error in ErrorRecord
+    """
+    kind = None
+
     def get_details(self):
         return self.details()
 
+    def message(self):
+        """Return the message of the error in one short line.
+        """
+        return self.details().split('\n', 1)[0]
+
 
 class LengthUnmatch(ScoreException):
+    kind = 'length'
+
     def __init__(self, len_gold_sentence, len_test_sentence):
         self.len_gold_sentence = len_gold_sentence
         self.len_test_sentence = len_test_sentence
 
+    def message(self):
+        return 'gold length {0}, test length {1}'.format(
+            self.len_gold_sentence, self.len_test_sentence)
+
     def details(self):
         a = "Length Unmatched !"
         b = "gold sentence:" + str(self.len_gold_sentence)
@@ -44,10 +76,20 @@ class LengthUnmatch(ScoreException):
 
 
 class WordsUnmatch(ScoreException):
+    kind = 'words'
+
     def __init__(self, gold_sentence, test_sentence):
         self.gold_sentence = gold_sentence
         self.test_sentence = test_sentence
 
+    def message(self):
+        for i, (gold, test) in enumerate(zip(self.gold_sentence,
+                                             self.test_sentence)):
+            if gold != test:
+                return 'word {0}: gold {1!r}, test {2!r}'.format(
+                    i, gold, test)
+        return 'words unmatched'
+
     def details(self):
         a = "Words Unmatched !"
         b = "gold sentence:" + str(self.gold_sentence)
@@ -58,59 +100,100 @@ class WordsUnmatch(ScoreException):
         return s
 
 
+class MissingSentence(ScoreException):
+    """The test item of a gold sentence which has no test sentence,
+    see align.Alignment.
+    """
+    kind = 'missing'
+
+    def __init__(self, description):
+        ScoreException.__init__(self, description)
+        self.description = description
+
+    def details(self):
+        return 'Missing test sentence: ' + self.description
+
+    def message(self):
+        return 'no test ' + self.description
+
+
 class Scorer:
     """The Scorer class.
 
     This class is a manager of scoring, it can socre tree
     corpus in a specific configuration.
     Every instance corresponding to a configuration.
-    """
-    def __init__(self):
-        pass
 
-    def _cal_spans(self, gold_nodes, test_nodes):
+    Attributes:
+        labels: count the brackets of each label into Result.labels
+        confusion: count the pairs of gold and test labels with
+                   the same span into Result.confusion
+        config: None, or the instance of config.Config applied
+                to the trees
+        buckets: the length buckets summed up besides all the
+                 sentences by evalb, see summary.Buckets. The
+                 CUTOFF_LEN of config is added to them.
+        profile: None, or the instance of instrument.Profile
+                 which records the time of each stage
+    """
+    def __init__(self, labels=False, confusion=False, config=None,
+                 buckets=(), profile=None):
+        self.labels = labels
+        self.confusion = confusion
+        self.config = config
+        self.buckets = list(buckets)
+        self.profile = profile
+
+    def _cal_spans(self, gold_keys, gold_spans, test_keys, test_spans):
         """Calculate the common span and across span
 
         Args:
-            gold_spans: a list of nodes in gold tree
-            test_spans: a list of nodes in test tree
+            gold_keys: a list of bracket keys in gold tree
+            gold_spans: a list of bracket spans in gold tree
+            test_keys: a list of bracket keys in test tree
+            test_spans: a list of bracket spans in test tree
 
         Returns:
             a tuple span_result:
                 span_result[0]: the number of common spans
                 span_result[1]: the number of crossing spans
         """
-        common = set(gold_nodes) & set(test_nodes)
-        unmatched_spans = [node.span for node in test_nodes
-                           if node not in common]
-        gold_spans = [node.span for node in gold_nodes]
-
-        cross_counter = 0
-        # the crossing spans
-        for u in unmatched_spans:
-            for g in gold_spans:
-                if (u.s < g.s and u.e > g.s and u.e < g.e):
-                    cross_counter += 1
-                    break
-                elif (u.s > g.s and u.s < g.e and u.e > g.e):
-                    cross_counter += 1
-                    break
-
+        common, cross_counter = self._match_spans(
+                gold_keys, gold_spans, test_keys, test_spans)
         return len(common), cross_counter
 
+    def _match_spans(self, gold_keys, gold_spans, test_keys, test_spans):
+        """The same as _cal_spans, but returns the set of common keys.
+        """
+        common = set(gold_keys)
+        common.intersection_update(test_keys)
+        unmatched_spans = [span for span, key
+                           in zip(test_spans, test_keys)
+                           if key not in common]
+
+        cross_counter = _count_crossing(unmatched_spans, gold_spans)
+
+        return common, cross_counter
+
     def score_trees(self, gold_tree, test_tree):
         '''Score the two trees
 
         Args:
-            gold_tree: the gold tree
-            test_tres: the test tree
+            gold_tree: the gold tree, an instance of Tree or CompactTree
+            test_tres: the test tree, an instance of Tree or CompactTree
 
         Returns:
             An instance of Result
         '''
+        if self.config is not None:
+            gold_tree = self._normalize(gold_tree)
+            test_tree = self._normalize(test_tree)
+        return self._score_trees(gold_tree, test_tree)
+
+    def _score_trees(self, gold_tree, test_tree):
         # Preparing
-        gold_label_nodes = gold_tree.non_terminal_labels
-        test_label_nodes = test_tree.non_terminal_labels
+        gold_keys = gold_tree.bracket_keys
+        test_keys = test_tree.bracket_keys
 
         gold_poss = gold_tree.poss
         test_poss = test_tree.poss
@@ -122,30 +205,137 @@ class Scorer:
         if len(gold_sentence) != len(test_sentence):
             raise LengthUnmatch(len(gold_sentence), len(test_sentence))
 
-        if gold_sentence != test_sentence:
+        if tuple(gold_sentence) != tuple(test_sentence):
             raise WordsUnmatch(gold_sentence, test_sentence)
 
         # Statistics
         result = Result()
-        common_numeber, cross_number = self._cal_spans(
-                gold_label_nodes, test_label_nodes)
+        common, cross_number = self._match_spans(
+                gold_keys, gold_tree.bracket_spans,
+                test_keys, test_tree.bracket_spans)
+        common_numeber = len(common)
+        if self.labels:
+            result.labels = _count_labels(gold_keys, test_keys, common)
+        if self.confusion:
+            result.confusion = _count_confusion(gold_keys, test_keys)
         correct_poss_num = sum([gold == test for gold, test
                                in zip(gold_poss, test_poss)])
 
-        result.length = len(gold_sentence)
+        if self.config is not None:
+            result.length = gold_tree.length
+        else:
+            result.length = len(gold_sentence)
         result.state = 0
-        result.recall = common_numeber / len(gold_label_nodes)
-        result.prec = common_numeber / len(test_label_nodes)
+        # The trees may have no brackets, such as a single word
+        result.recall = _ratio(common_numeber, len(gold_keys))
+        result.prec = _ratio(common_numeber, len(test_keys))
         result.matched_brackets = common_numeber
-        result.gold_brackets = len(gold_label_nodes)
-        result.test_brackets = len(test_label_nodes)
+        result.gold_brackets = len(gold_keys)
+        result.test_brackets = len(test_keys)
         result.cross_brackets = cross_number
         result.words = len(gold_sentence)
         result.correct_tags = correct_poss_num
-        result.tag_accracy = correct_poss_num / len(gold_poss)
+        result.tag_accracy = _ratio(correct_poss_num, len(gold_poss))
 
         return result
 
+    def iter_corpus(self, f_gold, f_test):
+        """
+        Score the treebanks sentence by sentence.
+
+        Args:
+            f_gold: a iterator of gold treebank, the items can be
+                    bracket strings or parsed trees
+            f_test: a iterator of test treebank, the items can be
+                    bracket strings or parsed trees
+
+        Yields:
+            an instance of Result for each sentence pair
+        """
+        return self._iter_pairs(zip(f_gold, f_test))
+
+    def iter_aligned(self, alignment):
+        """
+        Score the pairs of an alignment sentence by sentence.
+
+        Args:
+            alignment: an instance of align.Alignment
+
+        Yields:
+            an instance of Result for each gold sentence, the
+            sentences without test sentence are errors of kind
+            missing
+        """
+        return self._iter_pairs(alignment)
+
+    def _iter_pairs(self, pairs, start=0):
+        if self.profile is not None:
+            to_tree = self._timed_tree
+            score = self._timed_score
+        elif self.config is None:
+            to_tree = _to_tree
+            score = self._score_trees
+        else:
+            to_tree = self._prepare
+            score = self._score_trees
+
+        for ID, (gold, test) in enumerate(pairs, start):
+            try:
+                current_result = score(to_tree(gold), to_tree(test))
+            except ScoreException as e:
+                current_result = _error_result(ID, e.kind, e.message())
+            except ParsingError as e:
+                current_result = _error_result(ID, 'parse', e.errormessage)
+            current_result.ID = ID
+            yield current_result
+
+    def _prepare(self, item):
+        """Build the CompactTree with config while parsing,
+        parsed trees are normalized.
+        """
+        if isinstance(item, str):
+            return CompactTree(parser._create_root(item), self.config)
+        elif isinstance(item, (ParsingError, ScoreException)):
+            raise item.with_traceback(None)
+        return self._normalize(item)
+
+    def _timed_tree(self, item):
+        """The same as _to_tree and _prepare, but records the time
+        of parsing and building into the profile.
+        """
+        clock = time.perf_counter
+        profile = self.profile
+        if isinstance(item, str):
+            begin = clock()
+            root = parser._create_root(item)
+            middle = clock()
+            if self.config is None:
+                tree = Tree(root)
+            else:
+                tree = CompactTree(root, self.config)
+            profile.add('parse', middle - begin)
+            profile.add('build', clock() - middle)
+            return tree
+
+        begin = clock()
+        tree = _to_tree(item) if self.config is None else \
+            self._prepare(item)
+        profile.add('build', clock() - begin)
+        return tree
+
+    def _timed_score(self, gold_tree, test_tree):
+        begin = time.perf_counter()
+        result = self._score_trees(gold_tree, test_tree)
+        self.profile.add('match', time.perf_counter() - begin)
+        self.profile.sentences += 1
+        self.profile.tokens += result.words
+        return result
+
+    def _normalize(self, tree):
+        if isinstance(tree, CompactTree):
+            return tree.normalize(self.config)
+        return CompactTree(tree.root, self.config)
+
     def score_corpus(self, f_gold, f_test):
         """
         score the treebanks
@@ -157,26 +347,373 @@ class Scorer:
         Returns:
             a list of instances of Result
         """
-        results = []
-        for ID, (gold, test) in enumerate(zip(f_gold, f_test)):
+        return list(self.iter_corpus(f_gold, f_test))
+
+    def iter_corpus_parallel(self, f_gold, f_test, workers, chunk_size=500):
+        """
+        Score the treebanks in a pool of processes.
+
+        The sentence pairs are split into chunks, and each chunk is
+        scored by one worker. Only a few chunks are in flight at
+        the same time, and the chunks are returned in their
+        original order, so the output is the same as iter_corpus.
+
+        Args:
+            f_gold: a iterator of gold treebank
+            f_test: a iterator of test treebank
+            workers: the number of worker processes
+            chunk_size: the number of sentence pairs in each chunk
+
+        Yields:
+            a tuple (results, accumulator) for each chunk:
+                results: a list of instances of Result
+                accumulator: the summed up counters of the chunk
+        """
+        return self._iter_chunks(zip(f_gold, f_test), workers, chunk_size)
+
+    def _iter_chunks(self, pairs, workers, chunk_size):
+        # Imported here, it is slow to import and only needed by
+        # the parallel scoring.
+        import multiprocessing
+
+        pairs = iter(pairs)
+        pending = collections.deque()
+        with multiprocessing.Pool(workers) as pool:
+            for start in itertools.count(0, chunk_size):
+                chunk = list(itertools.islice(pairs, chunk_size))
+                if len(chunk) == 0:
+                    break
+                pending.append(pool.apply_async(
+                    _score_chunk, ((self, chunk, start),)))
+                if len(pending) >= 2 * workers:
+                    yield self._collect(pending.popleft().get())
+            while len(pending) != 0:
+                yield self._collect(pending.popleft().get())
+
+    def _collect(self, chunk):
+        """Merge the profile of a scored chunk.
+
+        Returns:
+            a tuple (results, accumulator)
+        """
+        results, accumulator, profile = chunk
+        if profile is not None:
+            self.profile.merge(profile)
+        return results, accumulator
+
+    def ascore_corpus(self, gold_aiter, test_aiter, batch_size=100,
+                      executor=None, max_pending=2):
+        """
+        Score the treebanks from async iterators.
+
+        The sentence pairs are read in batches, and each batch is
+        parsed and scored in the executor, so the event loop is
+        not blocked. At most max_pending batches are read ahead of
+        the consumer, a slow consumer stops the reading.
+
+        It needs Python 3.7 or later, see aio.py.
+
+        Usage:
+            async for result in scorer.ascore_corpus(gold, test):
+                ...
+
+        Args:
+            gold_aiter: a async iterator of gold treebank, plain
+                        iterators are accepted too
+            test_aiter: a async iterator of test treebank, plain
+                        iterators are accepted too
+            batch_size: the number of sentence pairs in each batch
+            executor: the executor to score the batches, the default
+                      executor of the event loop by default. A
+                      ProcessPoolExecutor scores in parallel.
+            max_pending: the number of batches in flight
+
+        Yields:
+            an instance of Result for each sentence pair
+        """
+        from . import aio
+
+        return aio.ascore_corpus(self, gold_aiter, test_aiter, batch_size,
+                                 executor, max_pending)
+
+    def evalb(self, gold_path, test_path, result_path,
+              workers=1, chunk_size=500, fmt='markdown', error_path=None,
+              align=None):
+        """Score the treebanks and write the report.
+
+        The results are summed up and written out while
+        scoring, so the memory usage does not grow with
+        the size of the treebanks.
+
+        Args:
+            gold_path: the path of gold treebank, or a parsed
+                       treebank such as Treebank or BinaryTreebank
+            test_path: the path of test treebank, or a parsed
+                       treebank such as Treebank or BinaryTreebank
+            result_path: the path of the result report
+            workers: the number of processes used to score,
+                     1 means scoring in current process
+            chunk_size: the number of sentence pairs sent to
+                        a worker process at a time
+            fmt: the format of the report, markdown, tsv, csv or jsonl
+            error_path: None, or the path of the error log, which has
+                        a line "ID<TAB>kind<TAB>message" for each
+                        error sentence
+            align: None to pair the sentences line by line, or
+                   the key of align.Alignment, id or words. The
+                   test sentences without gold sentence are
+                   counted as error sentences of kind inserted,
+                   their IDs are "test:" and their positions in
+                   the test treebank, and they have no rows.
+
+        Returns:
+            An instance of Summary.
+        """
+        with contextlib.ExitStack() as stack:
+            f_gold = _open_treebank(gold_path, stack)
+            f_test = _open_treebank(test_path, stack)
+            f_result = stack.enter_context(
+                    open(result_path, 'w', encoding='utf8'))
+            writer = report.get_writer(fmt, f_result)
+            f_error = None
+            if error_path is not None:
+                f_error = stack.enter_context(
+                        open(error_path, 'w', encoding='utf8'))
+            if self.profile is None:
+                return self._evalb(f_gold, f_test, writer, workers,
+                                   chunk_size, f_error, align)
+
+            from . import instrument
+            writer = instrument.TimedWriter(writer, self.profile)
+            self.profile.start()
             try:
-                gold_tree = parser.create_from_bracket_string(gold)
-                test_tree = parser.create_from_bracket_string(test)
-                current_result = self.score_trees(gold_tree, test_tree)
-            except (WordsUnmatch, LengthUnmatch) as e:
-                current_result = Result()
-                current_result.state = 2
-                print(e.details())
-            except ParsingError as e:
-                print(e.errormessage)
+                return self._evalb(f_gold, f_test, writer, workers,
+                                   chunk_size, f_error, align)
             finally:
-                current_result.ID = ID
-                results.append(current_result)
-        return results
-
-    def evalb(self, gold_path, test_path, result_path):
-        with open(gold_path, encoding='utf8') as gold_f:
-            with open(test_path, encoding='utf8') as test_f:
-                results = self.score_corpus(gold_f, test_f)
-                s = summary.summary(results)
-                summary.write_table(result_path, results, s)
+                self.profile.stop()
+
+    def _evalb(self, f_gold, f_test, writer, workers, chunk_size, f_error,
+               align):
+        alignment = None
+        if align is None:
+            pairs = zip(f_gold, f_test)
+        else:
+            from .align import Alignment
+            pairs = alignment = Alignment(f_gold, f_test, align)
+        accumulator = summary.Accumulator()
+        buckets = list(self.buckets)
+        if self.config is not None and self.config.cutoff_len is not None:
+            buckets.append(self.config.cutoff_len)
+        buckets = summary.Buckets(buckets)
+        writer.write_header()
+        if workers > 1:
+            chunks = self._iter_chunks(pairs, workers, chunk_size)
+            for results, partial in chunks:
+                accumulator.merge(partial)
+                for result in results:
+                    writer.write_row(result)
+                    buckets.add(result)
+                    if f_error is not None and result.error is not None:
+                        _write_error(f_error, result.error)
+        else:
+            for result in self._iter_pairs(pairs):
+                accumulator.add(result)
+                writer.write_row(result)
+                buckets.add(result)
+                if f_error is not None and result.error is not None:
+                    _write_error(f_error, result.error)
+        if alignment is not None:
+            for error in alignment.inserted:
+                accumulator.add(_error_result(*error))
+                if f_error is not None:
+                    _write_error(f_error, error)
+        s = accumulator.summary()
+        writer.write_summary(s)
+        for name, bucket_summary in buckets.summaries():
+            writer.write_summary(bucket_summary, name)
+        if self.labels:
+            writer.write_labels(accumulator.label_summary())
+        if self.confusion:
+            writer.write_confusion(accumulator.confusion)
+        if len(accumulator.errors) != 0:
+            writer.write_errors(accumulator.errors)
+        return s
+
+
+############################################################
+# Helping methods
+############################################################
+
+
+def _count_crossing(spans, gold_spans):
+    """Count the spans which cross at least one gold span.
+
+    A span u crosses a gold span g if
+        u.s < g.s < u.e < g.e   or   g.s < u.s < g.e < u.e
+
+    The first case means that among the gold spans starting
+    inside (u.s, u.e), the largest end is beyond u.e. The second
+    case means that among the gold spans ending inside (u.s, u.e),
+    the smallest start is before u.s. Both are answered by range
+    queries over sparse tables of the sorted gold starts and ends,
+    so the counting costs O((U+G) log G) instead of O(U*G).
+
+    Args:
+        spans: a list of spans to check
+        gold_spans: a list of gold spans
+
+    Returns:
+        the number of crossing spans
+    """
+    if len(spans) == 0 or len(gold_spans) == 0:
+        return 0
+
+    max_ends = dict()
+    min_starts = dict()
+    for g in gold_spans:
+        if g.s not in max_ends or max_ends[g.s] < g.e:
+            max_ends[g.s] = g.e
+        if g.e not in min_starts or min_starts[g.e] > g.s:
+            min_starts[g.e] = g.s
+    starts = sorted(max_ends)
+    ends = sorted(min_starts)
+    max_table = _sparse_table([max_ends[v] for v in starts], max)
+    min_table = _sparse_table([min_starts[v] for v in ends], min)
+
+    cross_counter = 0
+    for u in spans:
+        lo = bisect.bisect_right(starts, u.s)
+        hi = bisect.bisect_left(starts, u.e, lo)
+        if lo < hi and _query(max_table, max, lo, hi) > u.e:
+            cross_counter += 1
+            continue
+        lo = bisect.bisect_right(ends, u.s)
+        hi = bisect.bisect_left(ends, u.e, lo)
+        if lo < hi and _query(min_table, min, lo, hi) < u.s:
+            cross_counter += 1
+    return cross_counter
+
+
+def _count_labels(gold_keys, test_keys, common):
+    """Count the matched, gold and test brackets of each label.
+
+    Returns:
+        a dict from labels to the lists [matched, gold, test]
+    """
+    shift = 2 * POSITION_BITS
+    counts = dict()
+    for index, keys in ((0, common), (1, gold_keys), (2, test_keys)):
+        for key in keys:
+            label = key >> shift
+            if label not in counts:
+                counts[label] = [0, 0, 0]
+            counts[label][index] += 1
+    return dict((label_name(label), value)
+                for label, value in counts.items())
+
+
+def _count_confusion(gold_keys, test_keys):
+    """Count the pairs of gold and test labels with the same span.
+
+    The brackets of a span with the same label are paired first,
+    then the rest of the gold and test brackets of the span are
+    paired in their orders.
+
+    Returns:
+        a dict from (gold label, test label) to the number of pairs
+    """
+    shift = 2 * POSITION_BITS
+    mask = (1 << shift) - 1
+    spans = collections.defaultdict(list)
+    for key in gold_keys:
+        spans[key & mask].append(key >> shift)
+
+    test_spans = collections.defaultdict(list)
+    for key in test_keys:
+        span = key & mask
+        if span in spans:
+            test_spans[span].append(key >> shift)
+
+    pairs = collections.Counter()
+    for span, test_labels in test_spans.items():
+        gold_labels = list(spans[span])
+        rest = []
+        for label in test_labels:
+            if label in gold_labels:
+                gold_labels.remove(label)
+                pairs[label, label] += 1
+            else:
+                rest.append(label)
+        for gold, test in zip(gold_labels, rest):
+            pairs[gold, test] += 1
+    return dict(((label_name(gold), label_name(test)), count)
+                for (gold, test), count in pairs.items())
+
+
+def _sparse_table(values, func):
+    """Build the sparse table of values for range queries.
+
+    table[k][i] is func over values[i:i+2**k].
+    """
+    table = [values]
+    step = 1
+    while 2 * step <= len(values):
+        prev = table[-1]
+        table.append(list(map(func, prev[:-step], prev[step:])))
+        step *= 2
+    return table
+
+
+def _query(table, func, lo, hi):
+    """Return func over values[lo:hi], lo < hi.
+    """
+    k = (hi - lo).bit_length() - 1
+    return func(table[k][lo], table[k][hi - (1 << k)])
+
+
+def _open_treebank(path, stack):
+    """Open the treebank file, parsed treebanks are returned as they are.
+    """
+    if isinstance(path, str):
+        return stack.enter_context(open(path, encoding='utf8'))
+    return path
+
+
+def _error_result(ID, kind, message):
+    result = Result()
+    result.state = 2
+    result.error = ErrorRecord(ID, kind, message)
+    return result
+
+
+def _write_error(stream, error):
+    stream.write('{0}\t{1}\t{2}\n'.format(*error))
+
+
+def _to_tree(item):
+    """Parse the bracket string, parsed trees are returned as they are,
+    and the errors in place of trees are raised.
+    """
+    if isinstance(item, str):
+        return parser.create_from_bracket_string(item)
+    elif isinstance(item, (ParsingError, ScoreException)):
+        raise item.with_traceback(None)
+    return item
+
+
+def _score_chunk(args):
+    """Score a chunk of sentence pairs in a worker process.
+    """
+    scorer, pairs, start = args
+    profile = None
+    if scorer.profile is not None:
+        # A new profile for the chunk, the scorer may be shared
+        # with other threads.
+        from .instrument import Profile
+        scorer = copy.copy(scorer)
+        scorer.profile = profile = Profile()
+    results = list(scorer._iter_pairs(pairs, start))
+    accumulator = summary.Accumulator()
+    for result in results:
+        accumulator.add(result)
+    return results, accumulator, profile
@@ -0,0 +1,361 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 17:40:12
+# Last modified: 2026-10-18 17:40:12
+
+"""
+Long running evaluation server.
+
+The gold treebanks are loaded once and kept in memory, so scoring a
+test treebank costs neither the start-up of the process nor the
+parsing of the gold treebank:
+
+    python -m PYEVALB.server --gold dev=dev.txt --gold test=test.bin
+    python -m PYEVALB.server --socket /tmp/evalb.sock --gold dev=dev.txt
+
+The requests and responses are JSON objects, one on each line, read
+from stdin and written to stdout, or exchanged over a Unix socket.
+The responses have the same id as their requests:
+
+    {"id": 1, "op": "load", "name": "dev", "path": "dev.txt"}
+    {"id": 1, "sentences": 1700}
+
+    {"id": 2, "op": "score", "gold": "dev", "test_path": "out.txt"}
+    {"id": 3, "op": "score", "gold": "dev", "test": ["(S (A a))", ...],
+     "results": false}
+    {"id": 2, "summary": {...}, "results": [{...}, ...]}
+
+    {"id": 4, "op": "unload", "name": "dev"}
+    {"id": 5, "op": "shutdown"}
+    {"id": 4, "ok": true}
+
+A request which fails gets {"id": ..., "error": "..."}. The error
+sentences of a score request are counted in "errors" by kind, and
+the results of them have an "error" with the kind and the message.
+
+All the requests are handled by one scoring thread. The requests
+which arrive while it is busy are handled together as a batch: the
+score requests against the same gold treebank share the gold trees,
+so a binary gold treebank is decoded once for the whole batch.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+
+from .binary import BinaryTreebank
+from .binary import is_binary
+from .scorer import Scorer
+from .treebank import Treebank
+from . import summary
+
+
+class Server:
+    """The scoring thread and the preloaded gold treebanks.
+
+    Usage:
+        server = Server()
+        server.load('dev', 'dev.txt')
+        server.start()
+        response = server.submit(request).result()
+        server.stop()
+    """
+    def __init__(self, scorer=None):
+        """Construct a new server.
+
+        Args:
+            scorer: the instance of Scorer, a new one by default.
+        """
+        self.scorer = Scorer() if scorer is None else scorer
+        self._golds = dict()
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def load(self, name, path, cache_path=None):
+        """Load a gold treebank, bracket text or binary.
+
+        Returns:
+            the number of sentences.
+        """
+        if is_binary(path):
+            gold = BinaryTreebank(path)
+        else:
+            gold = Treebank.load(path, cache_path=cache_path)
+        self.unload(name)
+        self._golds[name] = gold
+        return len(gold)
+
+    def unload(self, name):
+        gold = self._golds.pop(name, None)
+        if isinstance(gold, BinaryTreebank):
+            gold.close()
+
+    def start(self):
+        """Start the scoring thread.
+        """
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scoring thread after the submitted requests.
+        """
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for name in list(self._golds):
+            self.unload(name)
+
+    def submit(self, request):
+        """Submit a request to the scoring thread.
+
+        Args:
+            request: dict - The decoded request.
+
+        Returns:
+            a concurrent.futures.Future of the response.
+        """
+        future = concurrent.futures.Future()
+        self._queue.put((request, future))
+        return future
+
+    def handle(self, request):
+        """Handle a request in current thread.
+        """
+        future = concurrent.futures.Future()
+        self._handle_batch([(request, future)])
+        return future.result()
+
+    def _run(self):
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            self._handle_batch(batch)
+
+    def _handle_batch(self, batch):
+        """Handle the requests in order, the score requests between
+        other requests are grouped by their gold treebanks.
+        """
+        groups = collections.OrderedDict()
+        for request, future in batch:
+            if request.get('op') == 'score':
+                groups.setdefault(request.get('gold'), []).append(
+                        (request, future))
+                continue
+            self._score_groups(groups)
+            groups.clear()
+            future.set_result(_respond(request, self._handle_op, request))
+        self._score_groups(groups)
+
+    def _handle_op(self, request):
+        op = request.get('op')
+        if op == 'load':
+            size = self.load(request['name'], request['path'],
+                             request.get('cache_path'))
+            return {'sentences': size}
+        elif op == 'unload':
+            self.unload(request['name'])
+            return {'ok': True}
+        elif op == 'shutdown':
+            return {'ok': True}
+        raise ValueError('Unknown op: ' + str(op))
+
+    def _score_groups(self, groups):
+        for name, items in groups.items():
+            gold = self._golds.get(name)
+            tests = []
+            for request, future in items:
+                if gold is None:
+                    future.set_result(_error(
+                        request, 'Unknown gold treebank: ' + str(name)))
+                    continue
+                test = _respond(request, _read_test, request)
+                if 'error' in test:
+                    future.set_result(test)
+                else:
+                    tests.append((request, future, test['trees']))
+            if len(tests) == 0:
+                continue
+
+            size = min(len(gold), max(len(v) for _, _, v in tests))
+            gold_trees = [gold[i] for i in range(size)]
+            for request, future, trees in tests:
+                future.set_result(_respond(
+                    request, self._score, request, gold_trees, trees))
+
+    def _score(self, request, gold_trees, test_trees):
+        accumulator = summary.Accumulator()
+        results = []
+        for result in self.scorer.iter_corpus(gold_trees, test_trees):
+            accumulator.add(result)
+            results.append(result)
+        response = {'summary': accumulator.summary()._asdict()}
+        if len(accumulator.errors) != 0:
+            response['errors'] = accumulator.errors
+        if request.get('results', True):
+            response['results'] = [result.todict() for result in results]
+        return response
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _respond(request, func, *args):
+    """Call func and make the response, the exception becomes
+    the error of the response.
+    """
+    response = {'id': request.get('id')}
+    try:
+        response.update(func(*args))
+    except Exception as e:
+        return _error(request, '{0}: {1}'.format(type(e).__name__, e))
+    return response
+
+
+def _error(request, message):
+    return {'id': request.get('id'), 'error': message}
+
+
+def _read_test(request):
+    """Read the test trees of a score request.
+    """
+    if 'test' in request:
+        return {'trees': list(request['test'])}
+    path = request['test_path']
+    if is_binary(path):
+        with BinaryTreebank(path) as treebank:
+            return {'trees': list(treebank)}
+    with open(path, encoding='utf8') as f:
+        return {'trees': f.readlines()}
+
+
+def _decode(line):
+    """Decode a request line, a bad line becomes a request without op.
+    """
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return {'op': None}
+    if not isinstance(request, dict):
+        return {'op': None}
+    return request
+
+
+def serve_stdio(server, stdin, stdout):
+    """Serve the requests from stdin until the end of it or shutdown.
+
+    The responses are written in the order of the requests. A batch
+    may finish the requests in another order, so a response waits
+    until the responses of all the earlier requests are written.
+    """
+    lock = threading.Lock()
+    # The futures of the requests whose responses are not written
+    pending = collections.deque()
+
+    def write(future):
+        with lock:
+            while len(pending) != 0 and pending[0].done():
+                stdout.write(json.dumps(pending.popleft().result()) + '\n')
+            stdout.flush()
+
+    server.start()
+    for line in stdin:
+        if len(line.strip()) == 0:
+            continue
+        request = _decode(line)
+        future = server.submit(request)
+        with lock:
+            pending.append(future)
+        future.add_done_callback(write)
+        if request.get('op') == 'shutdown':
+            break
+    server.stop()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = _decode(line.decode('utf8'))
+            response = self.server.evaluator.submit(request).result()
+            self.wfile.write((json.dumps(response) + '\n').encode('utf8'))
+            if request.get('op') == 'shutdown':
+                self.server.shutdown()
+                break
+
+
+class _UnixServer(socketserver.ThreadingMixIn,
+                  socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_socket(server, path):
+    """Serve the requests over a Unix socket until shutdown.
+
+    Each connection is served by a thread, the requests of many
+    connections are batched by the scoring thread.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    server.start()
+    unix_server = None
+    try:
+        # Not a context manager, which needs Python 3.6
+        unix_server = _UnixServer(path, _Handler)
+        unix_server.evaluator = server
+        unix_server.serve_forever()
+    finally:
+        if unix_server is not None:
+            unix_server.server_close()
+        server.stop()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--gold', help='A gold tree bank, NAME=PATH.',
+                      action='append', default=[])
+    args.add_argument('--socket', help=('The path of the Unix socket, '
+                                        'stdin and stdout by default.'),
+                      type=str, default=None)
+    args = args.parse_args()
+
+    server = Server()
+    for item in args.gold:
+        name, _, path = item.partition('=')
+        server.load(name, path)
+
+    if args.socket is not None:
+        serve_socket(server, args.socket)
+    else:
+        serve_stdio(server, sys.stdin, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 19:32:27
+# Last modified: 2026-10-18 19:32:27
+
+"""
+Significance tests of the scores.
+
+The scores of a corpus only depend on the sums of a few counts of
+each sentence, so a resampled corpus is a vector of weights, and the
+sums of many resampled corpora are one matrix product:
+
+    a = significance.counts(scorer.score_corpus(gold, test_a))
+    b = significance.counts(scorer.score_corpus(gold, test_b))
+    significance.confidence_interval(a)
+    significance.paired_bootstrap(a, b)
+    significance.approximate_randomization(a, b)
+
+The resamples are drawn in chunks, so the memory does not grow with
+the number of resamples. This module needs NumPy
+(pip install PYEVALB[numpy]).
+"""
+
+import collections
+
+import numpy as np
+
+# The counts of each sentence, each field is an array. The sentences
+# which are not valid have zero counts, as they are left out by
+# summary.summary.
+Counts = collections.namedtuple(
+        'Counts', ['matched_brackets', 'gold_brackets', 'test_brackets',
+                   'words', 'correct_tags'])
+
+METRICS = ['fmeasure', 'recall', 'prec', 'tagging_accuracy']
+
+Interval = collections.namedtuple('Interval', ['value', 'low', 'high'])
+
+Significance = collections.namedtuple('Significance', ['delta', 'p_value'])
+
+
+def counts(results):
+    """Collect the counts of the results.
+
+    Args:
+        results: a list of instances of Result, or the Statistics
+                 of batch.score_batch
+
+    Returns:
+        An instance of Counts.
+    """
+    if hasattr(results, 'matched_brackets'):
+        return Counts(*[np.asarray(getattr(results, name), dtype=np.int64)
+                        for name in Counts._fields])
+    columns = [[] for _ in Counts._fields]
+    for result in results:
+        valid = result.state == 0
+        for column, name in zip(columns, Counts._fields):
+            column.append(getattr(result, name) if valid else 0)
+    return Counts(*[np.array(column, dtype=np.int64)
+                    for column in columns])
+
+
+def scores(sums):
+    """Calculate the metrics from the sums of counts.
+
+    Args:
+        sums: an array of shape (..., 5), the last axis is
+              ordered by Counts
+
+    Returns:
+        a dict from the names in METRICS to the arrays of scores
+        in percent, 0 when there is nothing to divide.
+    """
+    sums = np.asarray(sums, dtype=np.float64)
+    matched, gold, test, words, correct = np.moveaxis(sums, -1, 0)
+    return {'fmeasure': _ratio(2 * matched, gold + test),
+            'recall': _ratio(matched, gold),
+            'prec': _ratio(matched, test),
+            'tagging_accuracy': _ratio(correct, words)}
+
+
+def confidence_interval(counts, resamples=10000, confidence=0.95,
+                        seed=None, chunk_size=200):
+    """Bootstrap confidence intervals of the metrics.
+
+    Args:
+        counts: an instance of Counts
+        resamples: the number of bootstrap resamples
+        confidence: the confidence level of the intervals
+        seed: the seed of the random generator
+        chunk_size: the number of resamples drawn at a time
+
+    Returns:
+        a dict from the names in METRICS to instances of Interval,
+        the bounds are the percentiles of the resampled scores.
+    """
+    matrix = _matrix(counts)
+    rng = np.random.RandomState(seed)
+    values = scores(matrix.sum(axis=0))
+
+    samples = dict((name, []) for name in METRICS)
+    for weights in _bootstrap_weights(rng, len(matrix), resamples,
+                                      chunk_size):
+        for name, value in scores(weights.dot(matrix)).items():
+            samples[name].append(value)
+
+    alpha = (1 - confidence) / 2 * 100
+    reval = dict()
+    for name in METRICS:
+        low, high = np.percentile(np.concatenate(samples[name]),
+                                  [alpha, 100 - alpha])
+        reval[name] = Interval(float(values[name]), float(low), float(high))
+    return reval
+
+
+def paired_bootstrap(counts_a, counts_b, resamples=10000, seed=None,
+                     chunk_size=200):
+    """Paired bootstrap test of the system a being better than b.
+
+    Both systems are resampled with the same sentences. As in
+    Berg-Kirkpatrick et al. (2012), the p-value is the fraction of
+    resamples whose delta is at least twice the observed delta.
+
+    Args:
+        counts_a: the Counts of the system a
+        counts_b: the Counts of the system b, of the same sentences
+        resamples: the number of bootstrap resamples
+        seed: the seed of the random generator
+        chunk_size: the number of resamples drawn at a time
+
+    Returns:
+        a dict from the names in METRICS to instances of Significance,
+        delta is the score of a minus the score of b.
+    """
+    matrix_a, matrix_b = _paired_matrices(counts_a, counts_b)
+    matrix = np.concatenate([matrix_a, matrix_b], axis=1)
+    rng = np.random.RandomState(seed)
+    delta = _delta(matrix.sum(axis=0))
+
+    hits = dict((name, 0) for name in METRICS)
+    for weights in _bootstrap_weights(rng, len(matrix), resamples,
+                                      chunk_size):
+        for name, value in _delta(weights.dot(matrix)).items():
+            hits[name] += int(np.count_nonzero(value >= 2 * delta[name]))
+    return dict((name, Significance(float(delta[name]),
+                                    hits[name] / resamples))
+                for name in METRICS)
+
+
+def approximate_randomization(counts_a, counts_b, trials=10000, seed=None,
+                              chunk_size=200):
+    """Approximate randomization test of the two systems.
+
+    In each trial, the counts of each sentence are swapped between
+    the systems with probability 0.5. The p-value is the fraction
+    of trials whose absolute delta is at least the observed one,
+    smoothed by one as in Riezler and Maxwell (2005).
+
+    Args:
+        counts_a: the Counts of the system a
+        counts_b: the Counts of the system b, of the same sentences
+        trials: the number of random trials
+        seed: the seed of the random generator
+        chunk_size: the number of trials drawn at a time
+
+    Returns:
+        a dict from the names in METRICS to instances of Significance,
+        delta is the score of a minus the score of b.
+    """
+    matrix_a, matrix_b = _paired_matrices(counts_a, counts_b)
+    diff = matrix_b - matrix_a
+    sum_a = matrix_a.sum(axis=0)
+    sum_b = matrix_b.sum(axis=0)
+    rng = np.random.RandomState(seed)
+    delta = _delta(np.concatenate([sum_a, sum_b]))
+
+    hits = dict((name, 0) for name in METRICS)
+    done = 0
+    while done < trials:
+        size = min(chunk_size, trials - done)
+        swaps = rng.randint(0, 2, (size, len(diff)))
+        moved = swaps.astype(np.float64).dot(diff)
+        sums = np.concatenate([sum_a + moved, sum_b - moved], axis=1)
+        for name, value in _delta(sums).items():
+            hits[name] += int(np.count_nonzero(
+                np.abs(value) >= abs(delta[name]) - 1e-9))
+        done += size
+    return dict((name, Significance(float(delta[name]),
+                                    (hits[name] + 1) / (trials + 1)))
+                for name in METRICS)
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _ratio(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b != 0, a / np.where(b != 0, b, 1) * 100, 0.0)
+
+
+def _matrix(counts):
+    """Stack the counts into a float matrix of shape (sentences, 5).
+    """
+    return np.stack([np.asarray(v, dtype=np.float64) for v in counts],
+                    axis=1)
+
+
+def _paired_matrices(counts_a, counts_b):
+    matrix_a = _matrix(counts_a)
+    matrix_b = _matrix(counts_b)
+    if matrix_a.shape != matrix_b.shape:
+        raise ValueError('The systems have different numbers of sentences.')
+    return matrix_a, matrix_b
+
+
+def _delta(sums):
+    """The scores of a minus b, the last axis of sums is a then b.
+    """
+    width = len(Counts._fields)
+    scores_a = scores(sums[..., :width])
+    scores_b = scores(sums[..., width:])
+    return dict((name, scores_a[name] - scores_b[name]) for name in METRICS)
+
+
+def _bootstrap_weights(rng, n, resamples, chunk_size):
+    """Yield the weights of bootstrap resamples in chunks.
+
+    Each row is the number of times each sentence is drawn, n
+    sentences are drawn with replacement, so a row is one draw of
+    the multinomial distribution with equal probabilities.
+    """
+    probabilities = [1.0 / n] * n
+    done = 0
+    while done < resamples:
+        size = min(chunk_size, resamples - done)
+        yield rng.multinomial(n, probabilities, size).astype(np.float64)
+        done += size
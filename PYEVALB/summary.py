@@ -15,8 +15,6 @@ Sum up the score result and wirte as markdown table.
 
 import collections
 
-import pytablewriter
-
 
 SUMMARY_TABLE = [
             'Number of sentence', 'Number of Error sentence',
@@ -36,26 +34,50 @@ SUMMARY_NAME_TABLE = [
 
 Summary = collections.namedtuple('Summary', SUMMARY_NAME_TABLE)
 
+LABEL_SUMMARY_TABLE = [
+            'label', 'gold_brackets', 'test_brackets', 'matched_brackets',
+            'recall', 'prec', 'fmeasure'
+            ]
+
+# The scores of one label, the ratios are in percent.
+LabelSummary = collections.namedtuple('LabelSummary', LABEL_SUMMARY_TABLE)
+
+ERROR_TABLE = ['ID', 'kind', 'message']
+
+# The error of one sentence pair, the kinds are:
+#   parse: the tree can not be parsed
+#   length: the sentences have different lengths
+#   words: the sentences have different words
+#   missing: the gold sentence has no test sentence, see align.py
+#   inserted: the test sentence has no gold sentence, see align.py,
+#             its ID is "test:" and its position in the test treebank
+ErrorRecord = collections.namedtuple('ErrorRecord', ERROR_TABLE)
+
 
 class Result:
     """The class of result data
 
     Attributes:
-        _staticis: is a dict of statistics:
-            ID: the ID of current sentence
-            length: the length of the sentence
-            state:  the state of the current compare  0:OK,1:skip,2:error
-            recall: the recall of the two trees
-                    recall = matched bracketing / brackets of gold data
-            prec:   the precision of the two trees
-                    prec = matched bracketing / brackets of test data
-            matched_brackets: the number of matched brackets
-            gold_brackets: the number of gold brackets
-            test_brackets: the number of test brackets
-            cross_brackets: the number of cross brackets
-            words: the number of unique words
-            correct_tags: the number of correct tags
-            tag_accracy: the accruacy of tags
+        ID: the ID of current sentence
+        length: the length of the sentence
+        state:  the state of the current compare  0:OK,1:skip,2:error
+        recall: the recall of the two trees
+                recall = matched bracketing / brackets of gold data
+        prec:   the precision of the two trees
+                prec = matched bracketing / brackets of test data
+        matched_brackets: the number of matched brackets
+        gold_brackets: the number of gold brackets
+        test_brackets: the number of test brackets
+        cross_brackets: the number of cross brackets
+        words: the number of unique words
+        correct_tags: the number of correct tags
+        tag_accracy: the accruacy of tags
+        labels: None, or a dict from labels to the lists
+                [matched, gold, test] of their brackets
+        confusion: None, or a dict from (gold label, test label)
+                   to the number of their brackets with the same span
+        error: None, or the instance of ErrorRecord when the
+               state is 2
     """
     STATISTICS_TABLE = [
             'ID', 'length', 'state', 'recall', 'prec', 'matched_brackets',
@@ -63,17 +85,29 @@ class Result:
             'cross_brackets', 'words', 'correct_tags', 'tag_accracy'
             ]
 
-    def __init__(self):
-        self._staticis = dict()
+    __slots__ = tuple(STATISTICS_TABLE) + ('labels', 'confusion', 'error')
 
-        # Initialize the dict
-        for name in Result.STATISTICS_TABLE:
-            self._staticis[name] = 0
+    def __init__(self):
+        self.ID = 0
+        self.length = 0
+        self.state = 0
+        self.recall = 0
+        self.prec = 0
+        self.matched_brackets = 0
+        self.gold_brackets = 0
+        self.test_brackets = 0
+        self.cross_brackets = 0
+        self.words = 0
+        self.correct_tags = 0
+        self.tag_accracy = 0
+        self.labels = None
+        self.confusion = None
+        self.error = None
 
     def tolist(self):
         reval = []
         for name in Result.STATISTICS_TABLE:
-            value = self._staticis[name]
+            value = getattr(self, name)
             if type(value) == int:
                 value = '%d' % value
             else:
@@ -81,10 +115,18 @@ class Result:
             reval.append(value)
         return reval
 
+    def todict(self):
+        reval = dict((name, getattr(self, name))
+                     for name in Result.STATISTICS_TABLE)
+        if self.error is not None:
+            reval['error'] = {'kind': self.error.kind,
+                              'message': self.error.message}
+        return reval
+
     def __repr__(self):
         sout = ''
         for name in Result.STATISTICS_TABLE:
-            value = self._staticis[name]
+            value = getattr(self, name)
             s = name + ":"
             if type(value) == int:
                 ss = '{0: >3d}'.format(value)
@@ -93,45 +135,215 @@ class Result:
             sout += (s+ss+' ')
         return sout
 
-    def __getattr__(self, name):
-        if name == "_staticis":
-            return self.__dict__[name]
-        elif name in Result.STATISTICS_TABLE:
-            return self._staticis.get(name, 0)
-        else:
-            raise AttributeError
 
-    def __setattr__(self, name, value):
-        if name == "_staticis":
-            self.__dict__[name] = value
-        elif name in Result.STATISTICS_TABLE:
-            self._staticis[name] = value
-        else:
-            print(name)
-            raise AttributeError
+class Accumulator:
+    """Running counters of the corpus statistics.
 
+    The accumulator makes it possible to sum up the results
+    of a corpus sentence by sentence, without holding all
+    the instances of Result in memory.
 
-def write_table(path, results, summary):
-    with open(path, 'w', encoding='utf8') as f:
-        writer = pytablewriter.MarkdownTableWriter()
-        writer.stream = f
-        writer.table_name = 'Score Result'
-        writer.header_list = [' ' + v + ' ' for v
-                              in Result.STATISTICS_TABLE]
-        writer.value_matrix = [v.tolist() for v in results]
-        writer.write_table()
+    Attributes:
+        sent_num: the number of sentences
+        error_sent_num: the number of error sentences
+        skip_sent_num: the number of skipped sentences
+        valid_sent_num: the number of valid sentences
+        matched_brackets: the total number of matched brackets
+        gold_brackets: the total number of gold brackets
+        test_brackets: the total number of test brackets
+        cross_brackets: the total number of cross brackets
+        complete_match: the number of completely matched sentences
+        no_crossing: the number of sentences without cross brackets
+        words: the total number of words
+        correct_tags: the total number of correct tags
+        labels: a dict from labels to the lists [matched, gold, test]
+        confusion: a dict from (gold label, test label) to the
+                   number of brackets with the same span
+        errors: a dict from the kinds of errors to the number
+                of error sentences
+    """
+    COUNTER_TABLE = [
+            'sent_num', 'error_sent_num', 'skip_sent_num',
+            'valid_sent_num', 'matched_brackets', 'gold_brackets',
+            'test_brackets', 'cross_brackets', 'complete_match',
+            'no_crossing', 'words', 'correct_tags'
+            ]
 
-        summary = _summary2string(summary)
+    def __init__(self):
+        for name in Accumulator.COUNTER_TABLE:
+            setattr(self, name, 0)
+        self.labels = dict()
+        self.confusion = dict()
+        self.errors = dict()
+
+    def add(self, result):
+        """Add the result of one sentence into the counters.
+
+        Args:
+            result: an instance of Result
+        """
+        self._update(result, 1)
+
+    def remove(self, result):
+        """Subtract the result of one sentence which was added before.
+
+        Args:
+            result: an instance of Result
+        """
+        self._update(result, -1)
+
+    def _update(self, result, sign):
+        self.sent_num += sign
+        if result.state == 2:
+            self.error_sent_num += sign
+            if result.error is not None:
+                _merge_counts(self.errors, {result.error.kind: 1}, sign)
+            return
+        elif result.state == 1:
+            self.skip_sent_num += sign
+            return
+
+        self.valid_sent_num += sign
+        self.matched_brackets += sign * result.matched_brackets
+        self.gold_brackets += sign * result.gold_brackets
+        self.test_brackets += sign * result.test_brackets
+        self.cross_brackets += sign * result.cross_brackets
+        self.words += sign * result.words
+        self.correct_tags += sign * result.correct_tags
+        if (result.matched_brackets == result.gold_brackets and
+                result.matched_brackets == result.test_brackets):
+            self.complete_match += sign
+        if result.cross_brackets == 0:
+            self.no_crossing += sign
+        if result.labels is not None:
+            _merge_labels(self.labels, result.labels, sign)
+        if result.confusion is not None:
+            _merge_counts(self.confusion, result.confusion, sign)
+
+    def merge(self, other):
+        """Add the counters of another accumulator into this one.
+
+        Args:
+            other: an instance of Accumulator
+        """
+        for name in Accumulator.COUNTER_TABLE:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        _merge_labels(self.labels, other.labels, 1)
+        _merge_counts(self.confusion, other.confusion, 1)
+        _merge_counts(self.errors, other.errors, 1)
+
+    def summary(self):
+        """Calculate the summary from the current counters.
+
+        The ratios are 0 when there is nothing to divide, for example
+        when there is no valid sentence.
+
+        Returns:
+            An instance of Summary.
+        """
+        sentn = self.valid_sent_num
+        recall = _ratio(self.matched_brackets, self.gold_brackets) * 100
+        prec = _ratio(self.matched_brackets, self.test_brackets) * 100
+        summay_list = [
+                self.sent_num, self.error_sent_num,
+                self.skip_sent_num, sentn,
+                recall, prec,
+                _ratio(2 * recall * prec, recall + prec),
+                _ratio(self.complete_match, sentn) * 100,
+                _ratio(self.cross_brackets, sentn),
+                _ratio(self.no_crossing, sentn) * 100,
+                _ratio(self.correct_tags, self.words) * 100
+                ]
+        summay_list = [float(v) for v in summay_list]
+        return Summary(*summay_list)
+
+    def label_summary(self):
+        """Calculate the scores of each label.
+
+        Returns:
+            a list of instances of LabelSummary, the labels with
+            more gold brackets come first.
+        """
+        reval = []
+        for label, (matched, gold, test) in self.labels.items():
+            recall = _ratio(matched, gold) * 100
+            prec = _ratio(matched, test) * 100
+            reval.append(LabelSummary(
+                label, gold, test, matched, float(recall), float(prec),
+                float(_ratio(2 * recall * prec, recall + prec))))
+        reval.sort(key=lambda v: (-v.gold_brackets, -v.test_brackets,
+                                  v.label))
+        return reval
 
-        f.write('\n')
-        f.write('='*145)
-        f.write('\n')
-        f.write(summary)
+
+class Buckets:
+    """The accumulators of the sentences in length buckets.
+
+    A bucket is a cutoff N, which holds the sentences with
+    length <= N, or a pair (low, high), which holds the
+    sentences with low < length <= high. A sentence can
+    be in many buckets.
+    """
+    def __init__(self, buckets):
+        """Construct the buckets.
+
+        Args:
+            buckets: a list of cutoffs or pairs (low, high)
+        """
+        self._bounds = []
+        self._names = []
+        for bucket in buckets:
+            if isinstance(bucket, int):
+                low, high = -1, bucket
+                name = 'len<={0}'.format(high)
+            else:
+                low, high = bucket
+                name = '{0}<len<={1}'.format(low, high)
+            if name not in self._names:
+                self._bounds.append((low, high))
+                self._names.append(name)
+        self._accumulators = [Accumulator() for _ in self._bounds]
+
+    def add(self, result):
+        """Add the result into the buckets of its length.
+
+        The error sentences are in no bucket, their length is
+        unknown, the length of their results is always 0.
+        """
+        if result.state == 2:
+            return
+        length = result.length
+        for (low, high), accumulator in zip(self._bounds,
+                                            self._accumulators):
+            if low < length <= high:
+                accumulator.add(result)
+
+    def summaries(self):
+        """Return a list of (name, Summary) of the buckets.
+        """
+        return [(name, accumulator.summary()) for name, accumulator
+                in zip(self._names, self._accumulators)]
+
+    def __len__(self):
+        return len(self._names)
+
+
+def write_table(path, results, summary):
+    from .report import MarkdownWriter
+
+    with open(path, 'w', encoding='utf8') as f:
+        writer = MarkdownWriter(f)
+        writer.write_header()
+        for result in results:
+            writer.write_row(result)
+        writer.write_summary(summary)
 
 
 def summary(results):
     """Calculate the summary of resutls
 
+    The results are summed up in one pass by Accumulator.
+
     Args:
         results: a list of result of each sentence
 
@@ -139,66 +351,38 @@ def summary(results):
         a list contains all the summary data.
         The data in the list is ordered by Result.SUMMARY_TABLE.
     """
-    summay_list = [0] * len(SUMMARY_TABLE)
-
-    # Number of sentence
-    summay_list[0] = len(results)
-
-    # Number of Error sentence
-    # 2:Error
-    summay_list[1] = len([item for item in results if item.state == 2])
-
-    # Number of Skip sentence
-    # 1:skip
-    summay_list[2] = len([item for item in results if item.state == 1])
+    accumulator = Accumulator()
+    for result in results:
+        accumulator.add(result)
+    return accumulator.summary()
 
-    correct_results = [item for item in results if item.state == 0]
-    sentn = len(correct_results)
-
-    # Number of Skip sentence
-    summay_list[3] = sentn
-
-    # Bracketing Recall: matched brackets / gold brackets
-    summay_list[4] = (sum([item.matched_brackets for
-                           item in correct_results]) /
-                      sum([item.gold_brackets for
-                           item in correct_results])) * 100
-
-    # Bracketing Precision: matched brackets / test brackets
-    summay_list[5] = (sum([item.matched_brackets for
-                          item in correct_results]) /
-                      sum([item.test_brackets for
-                          item in correct_results])) * 100
-
-    # Bracketing FMeasure
-    summay_list[6] = ((2 * summay_list[4] * summay_list[5]) /
-                      (summay_list[4] + summay_list[5]))
+########################################################
+# Helping methods
+########################################################
 
-    # Complete match
-    summay_list[7] = (len([item for item in correct_results
-                      if item.matched_brackets == item.gold_brackets and
-                      item.matched_brackets ==
-                      item.test_brackets]) / sentn * 100)
 
-    # Average crossing
-    summay_list[8] = (sum([item.cross_brackets for
-                      item in correct_results]) / sentn)
+def _ratio(a, b):
+    return a / b if b != 0 else 0
 
-    # No crossing
-    summay_list[9] = (len([item for item in correct_results
-                      if item.cross_brackets == 0]) / sentn * 100)
 
-    # Tagging accuracy: total correct tags / total words
-    summay_list[10] = (sum([item.correct_tags for item
-                       in correct_results]) /
-                       sum([item.words for item in correct_results])) * 100
+def _merge_labels(labels, other, sign):
+    for label, counts in other.items():
+        current = labels.get(label)
+        if current is None:
+            current = labels[label] = [0, 0, 0]
+        for i in range(3):
+            current[i] += sign * counts[i]
+        if sign < 0 and not any(current):
+            del labels[label]
 
-    summay_list = [float(v) for v in summay_list]
-    return Summary(*summay_list)
 
-########################################################
-# Helping methods
-########################################################
+def _merge_counts(counts, other, sign):
+    for key, count in other.items():
+        count = counts.get(key, 0) + sign * count
+        if count == 0:
+            counts.pop(key, None)
+        else:
+            counts[key] = count
 
 
 def _summary2string(summary):
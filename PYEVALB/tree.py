@@ -15,10 +15,61 @@ Bracket Tree Class.
 Loading the bracket trees.
 """
 
+import array
 import collections
+import sys
+import threading
 
 Span = collections.namedtuple('Span', ['s', 'e'])
 
+# Create a Span without the argument checking of Span.__new__
+_new_span = tuple.__new__
+
+# The span of a node which is not in a tree yet.
+_NO_SPAN = Span(-1, -1)
+
+# The interned ids of labels, shared by all the trees.
+_LABEL_IDS = dict()
+_LABEL_NAMES = []
+_LABEL_LOCK = threading.Lock()
+
+# The number of bits of each position in a bracket key.
+POSITION_BITS = 24
+
+
+def label_id(label):
+    """Return the interned integer id of the label.
+    """
+    try:
+        return _LABEL_IDS[label]
+    except KeyError:
+        with _LABEL_LOCK:
+            if label not in _LABEL_IDS:
+                _LABEL_IDS[label] = len(_LABEL_NAMES)
+                _LABEL_NAMES.append(label)
+            return _LABEL_IDS[label]
+
+
+def label_name(label):
+    """Return the label of the interned integer id.
+    """
+    return _LABEL_NAMES[label]
+
+
+def bracket_key(label, s, e):
+    """Pack a bracket into one integer.
+
+    Args:
+        label: int - The id of the label.
+        s: int - The start of the span.
+        e: int - The end of the span.
+
+    Returns:
+        int - Two brackets have the same key if and only if
+              they have the same label and the same span.
+    """
+    return (((label << POSITION_BITS) | s) << POSITION_BITS) | e
+
 
 class Node:
     """The definition of node class.
@@ -27,7 +78,9 @@ class Node:
         value: The value of this node.
         children: A list of children nodes.
     """
-    def __init__(self, value):
+    __slots__ = ('_value', '_children', '_span')
+
+    def __init__(self, value, children=None):
         """Construct for a new Node class
 
         Args:
@@ -38,8 +91,8 @@ class Node:
             children: list(Node) - The children of this node.
         """
         self._value = value.strip()
-        self._children = []
-        self._span = Span(-1, -1)
+        self._children = [] if children is None else children
+        self._span = _NO_SPAN
 
     def isLeaf(self):
         return len(self.children) == 0
@@ -71,6 +124,13 @@ class Node:
     def span(self, value):
         self._span = value
 
+    @property
+    def key(self):
+        """Return the integer key of the bracket of this node.
+        """
+        return bracket_key(label_id(self._value),
+                           self._span.s, self._span.e)
+
     ########################################################
     # Magic methods
     ########################################################
@@ -81,10 +141,12 @@ class Node:
         return s+p
 
     def __eq__(self, node):
-        return str(self) == str(node)
+        if not isinstance(node, Node):
+            return NotImplemented
+        return self._value == node._value and self._span == node._span
 
     def __hash__(self):
-        return hash(str(self))
+        return hash((self._value, self._span))
 
 
 class Tree:
@@ -107,19 +169,8 @@ class Tree:
         else:
             self._root = root
 
-        # Initialization
-        values = self._get_nodes()
-        self._terminal = values[0]
-        self._non_terminal = values[1]
-        self._non_terminal_labels = values[2]
-        self._depth = values[3]
-
-        self._pos_sentence = self._get_pos_sentence(self.root)
-        self._sentence, self._poss = self._extract_sequence(self._pos_sentence)
-
-        # Set the span for each node
-        self._length = 0
-        self._set_span(self.root)
+        # Collect the nodes, words, tags and spans in one pass
+        self._build()
 
     ########################################################
     # Property methods
@@ -153,6 +204,18 @@ class Tree:
         """
         return self._non_terminal_labels
 
+    @property
+    def bracket_keys(self):
+        """Return a list of the integer keys of label nodes.
+        """
+        return [node.key for node in self._non_terminal_labels]
+
+    @property
+    def bracket_spans(self):
+        """Return a list of the spans of label nodes.
+        """
+        return [node.span for node in self._non_terminal_labels]
+
     @property
     def depth(self):
         """Return the depth of current tree.
@@ -184,7 +247,7 @@ class Tree:
         For example:
         [上海_NN 浦东_NR 开发_NN 与_CC 法制_NN 建设_NN 同步_VV]
         """
-        return self._pos_sentence
+        return ['_'.join(item) for item in zip(self._sentence, self._poss)]
 
     ########################################################
     # Helping methods
@@ -193,8 +256,13 @@ class Tree:
         """Make the deep copy of given node and its subtree.
         """
         new_root = Node(root.value)
-        for child in root.children:
-            new_root.children.append(self._deepcopy(child))
+        stack = [(root, new_root)]
+        while len(stack) != 0:
+            node, new_node = stack.pop()
+            for child in node.children:
+                new_child = Node(child.value)
+                new_node.children.append(new_child)
+                stack.append((child, new_child))
         return new_root
 
     def _to_bracket(self, node):
@@ -206,89 +274,345 @@ class Tree:
         Return:
             str - A bracket string.
         """
-        # For pos tag label node
-        if node.isPos():
-            pos_tag = node.value
-            word = node.children[0].value
-            s = '('+' '.join([pos_tag, word])+')'
-            return s
-        # Constituent label node
-        else:
-            string = []
-            for child in node.children:
-                string.append(self._to_bracket(child))
-            string = ' '.join(string)
-            label = node.value
-            string = '(' + label + ' ' + string + ')'
-            return string
-
-    def _get_pos_sentence(self, node):
-        """Return the plain sentence
-        Args:
-            node: a tree node.
-        Return:
-            a list of word_pos in the sentence
-            For example:
-                ['上海_NR', '浦东_NR', '开发_NN', '与_CC',
-                '法制_NN', '建设_NN', '同步_VV']
+        parts = []
+        # Each item is a node, or a string to output
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if type(node) is str:
+                parts.append(node)
+            # For pos tag label node
+            elif node.isPos():
+                pos_tag = node.value
+                word = node.children[0].value
+                parts.append('('+' '.join([pos_tag, word])+')')
+            # Constituent label node
+            else:
+                parts.append('(' + node.value + ' ')
+                stack.append(')')
+                for i, child in enumerate(reversed(node.children)):
+                    if i != 0:
+                        stack.append(' ')
+                    stack.append(child)
+        return ''.join(parts)
+
+    def _build(self):
+        """Walk the tree once in DFS order with an explicit stack.
+
+        Collects the terminal, non-terminal and label nodes, the
+        words and pos tags, the depth of the tree, and sets the
+        span of each node. A node is visited twice: when it is
+        opened its start is the number of words seen so far,
+        and when it is closed its end is known.
         """
-        if node.isPos():
-            leaf = node.children[0]
-            return ['_'.join([leaf.value, node.value])]
-        else:
-            partial = []
-            for child in node.children:
-                partial += self._get_pos_sentence(child)
-            return partial
+        terminal = []
+        non_terminal = []
+        labels = []
+        sentence = []
+        poss = []
+        depth = 0
+        length = 0
+
+        # Each item is (node, level, start), start is None
+        # until all the children of the node are visited.
+        stack = [(self._root, 0, None)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            node, level, start = pop()
+            if start is not None:
+                node._span = _new_span(Span, (start, length))
+                continue
+
+            children = node._children
+            if not children:
+                terminal.append(node)
+                node._span = _new_span(Span, (length, length+1))
+                length += 1
+                if level > depth:
+                    depth = level
+                continue
+
+            non_terminal.append(node)
+            if len(children) == 1 and not children[0]._children:
+                sentence.append(children[0]._value)
+                poss.append(node._value)
+            else:
+                labels.append(node)
+
+            push((node, level, length))
+            level += 1
+            for child in reversed(children):
+                push((child, level, None))
+
+        self._terminal = terminal
+        self._non_terminal = non_terminal
+        self._non_terminal_labels = labels
+        self._sentence = sentence
+        self._poss = poss
+        self._depth = depth
+        self._length = length
 
-    def _extract_sequence(self, pos_sentence):
-        sentence = [item.split('_')[0] for item in pos_sentence]
-        poss = [item.split('_')[-1] for item in pos_sentence]
+    ########################################################
+    # Magic methods
+    ########################################################
+    def __repr__(self):
+        return self._to_bracket(self.root)
+
+
+class CompactTree:
+    """The read-only tree for scoring.
+
+    Only the label nodes (all nodes except pos tag and word node)
+    are kept, in DFS order, as parallel arrays of integers.
 
-        return sentence, poss
+    Attributes:
+        labels: array - The label ids of label nodes.
+        starts: array - The span starts of label nodes.
+        ends: array - The span ends of label nodes.
+        parents: array - The index of the parent label node,
+                         -1 for the root.
+        sentence: tuple - The words.
+        poss: tuple - The pos tags.
+        length: int - The length of the sentence by the config, which
+                      counts the words deleted by DELETE_LABEL, None
+                      if the tree is built without config.
+    """
+    __slots__ = ('labels', 'starts', 'ends', 'parents', 'sentence', 'poss',
+                 'length')
+
+    def __init__(self, root, config=None):
+        """Build the arrays from a tree.
+
+        Args:
+            root: Node - The root node of a tree.
+            config: Config - The settings applied while the brackets
+                             are collected, see config.py.
+        """
+        if config is not None:
+            self._build_with_config(root, config)
+            return
 
-    def _get_nodes(self):
-        """Collect the different type nodes
+        labels = array.array('i')
+        starts = array.array('i')
+        ends = array.array('i')
+        parents = array.array('i')
+        sentence = []
+        poss = []
+        length = 0
+
+        # Each item is (node, parent, index), index is None
+        # until all the children of the node are visited.
+        stack = [(root, -1, None)]
+        while stack:
+            node, parent, index = stack.pop()
+            if index is not None:
+                ends[index] = length
+                continue
+
+            children = node._children
+            if not children:
+                length += 1
+                continue
+            if len(children) == 1 and not children[0]._children:
+                sentence.append(sys.intern(children[0]._value))
+                poss.append(sys.intern(node._value))
+                length += 1
+                continue
+
+            index = len(labels)
+            labels.append(label_id(node._value))
+            starts.append(length)
+            ends.append(length)
+            parents.append(parent)
+            stack.append((node, parent, index))
+            for child in reversed(children):
+                stack.append((child, index, None))
+
+        self.labels = labels
+        self.starts = starts
+        self.ends = ends
+        self.parents = parents
+        self.sentence = tuple(sentence)
+        self.poss = tuple(poss)
+        self.length = None
+
+    def _build_with_config(self, root, config):
+        """The same as __init__, but the words of deleted pos tags are
+        skipped, the brackets of deleted labels are skipped with their
+        children kept, and the labels are mapped by config.
+
+        The length is counted before the words are deleted, only the
+        words of DELETE_LABEL_FOR_LENGTH are not counted, as Evalb.
+        """
+        labels = array.array('i')
+        starts = array.array('i')
+        ends = array.array('i')
+        parents = array.array('i')
+        sentence = []
+        poss = []
+        length = 0
+        sentence_length = 0
+        deleted = config.delete_labels
+        deleted_for_length = config.delete_labels_for_length
+        map_label = config.label
+
+        stack = [(root, -1, None)]
+        while stack:
+            node, parent, index = stack.pop()
+            if index is not None:
+                ends[index] = length
+                continue
+
+            children = node._children
+            if not children:
+                length += 1
+                continue
+            if len(children) == 1 and not children[0]._children:
+                if node._value not in deleted_for_length:
+                    sentence_length += 1
+                if node._value not in deleted:
+                    sentence.append(sys.intern(children[0]._value))
+                    poss.append(sys.intern(node._value))
+                    length += 1
+                continue
+
+            label = map_label(node._value)
+            if label < 0:
+                for child in reversed(children):
+                    stack.append((child, parent, None))
+                continue
+            index = len(labels)
+            labels.append(label)
+            starts.append(length)
+            ends.append(length)
+            parents.append(parent)
+            stack.append((node, parent, index))
+            for child in reversed(children):
+                stack.append((child, index, None))
+
+        self.labels = labels
+        self.starts = starts
+        self.ends = ends
+        self.parents = parents
+        self.sentence = tuple(sentence)
+        self.poss = tuple(poss)
+        self.length = sentence_length
+        # The brackets left without words
+        if any(s == e for s, e in zip(starts, ends)):
+            self._filter(labels)
+
+    def normalize(self, config):
+        """Apply the settings of config to a tree built without them.
+
+        A tree built with a config already carries its settings, its
+        labels are mapped and its length is counted before the words
+        are deleted, so it is returned as it is.
 
         Returns:
-            terminal: list(node) - A list of terminal(leaf) node.
-            non_terminal: list(node)- A list of non-terminal(leaf) node.
-            depth: int - The depth of current tree.
+            a new instance of CompactTree, or the tree itself if it
+            is built with a config.
+
+        Raises:
+            ValueError: if words must be deleted from a tree which
+                        has words outside pos tags, their positions
+                        are unknown.
         """
-        nodes = []
-        depth = self._depth(self.root, nodes)
-        terminal = [node for node in nodes if node.isLeaf() is True]
-        non_terminal = [node for node in nodes if node.isLeaf() is False]
-        labels = [node for node in nodes
-                  if node.isPos() is False and node.isLeaf() is False]
-        return terminal, non_terminal, labels, depth
-
-    def _depth(self, node, nodes):
-        """Transfer the ndoes in DFS order.
+        if self.length is not None:
+            return self
+        deleted = config.delete_labels
+        keep = [pos not in deleted for pos in self.poss]
+        size = self.ends[0] if len(self.labels) != 0 else len(self.poss)
+        tree = CompactTree.from_arrays(
+                array.array('i', map(config.label_of_id, self.labels)),
+                self.starts, self.ends, self.parents,
+                self.sentence, self.poss)
+        tree.length = config.length(self.poss)
+
+        if not all(keep):
+            if size != len(self.poss):
+                raise ValueError('The words outside pos tags can not be '
+                                 'deleted from a compact tree.')
+            # The new position of each old position
+            positions = [0]
+            for value in keep:
+                positions.append(positions[-1] + value)
+            tree.starts = array.array('i', [positions[v]
+                                            for v in self.starts])
+            tree.ends = array.array('i', [positions[v] for v in self.ends])
+            tree.sentence = tuple(v for v, k in zip(self.sentence, keep)
+                                  if k)
+            tree.poss = tuple(v for v, k in zip(self.poss, keep) if k)
+
+        if any(label < 0 for label in tree.labels) or \
+                any(s == e for s, e in zip(tree.starts, tree.ends)):
+            tree._filter(tree.labels)
+        return tree
+
+    def _filter(self, labels):
+        """Remove the brackets of deleted labels and without words,
+        the children of a removed bracket move to its parent.
         """
-        nodes.append(node)
-        depths = []
-        if node.isLeaf() is False:
-            for child in node.children:
-                depths.append(self._depth(child, nodes))
-            return max(depths) + 1
-        else:
-            return 0
+        # The new index of each kept bracket, or the new index of
+        # the nearest kept ancestor of a removed bracket.
+        ancestors = []
+        kept = []
+        parents = array.array('i')
+        for i, parent in enumerate(self.parents):
+            up = ancestors[parent] if parent >= 0 else -1
+            if labels[i] >= 0 and self.starts[i] != self.ends[i]:
+                kept.append(i)
+                parents.append(up)
+                ancestors.append(len(kept) - 1)
+            else:
+                ancestors.append(up)
+        self.labels = array.array('i', [labels[i] for i in kept])
+        self.starts = array.array('i', [self.starts[i] for i in kept])
+        self.ends = array.array('i', [self.ends[i] for i in kept])
+        self.parents = parents
+
+    @classmethod
+    def from_tree(cls, tree, config=None):
+        return cls(tree.root, config)
+
+    @classmethod
+    def from_arrays(cls, labels, starts, ends, parents, sentence, poss):
+        """Create a tree from the arrays directly.
+        """
+        tree = cls.__new__(cls)
+        tree.labels = labels
+        tree.starts = starts
+        tree.ends = ends
+        tree.parents = parents
+        tree.sentence = sentence
+        tree.poss = poss
+        tree.length = None
+        return tree
 
-    def _set_span(self, node):
-        if node.isLeaf():
-            node.span = Span(self._length, self._length+1)
-            self._length += 1
-            return
-        else:
-            for child in node.children:
-                self._set_span(child)
-            node.span = Span(
-                    node.children[0].span.s,
-                    node.children[-1].span.e)
+    @property
+    def bracket_keys(self):
+        """Return a list of the integer keys of label nodes.
+        """
+        return list(map(bracket_key, self.labels, self.starts, self.ends))
 
-    ########################################################
-    # Magic methods
-    ########################################################
-    def __repr__(self):
-        return self._to_bracket(self.root)
+    @property
+    def bracket_spans(self):
+        """Return a list of the spans of label nodes.
+        """
+        return [_new_span(Span, span) for span
+                in zip(self.starts, self.ends)]
+
+    def __len__(self):
+        return len(self.sentence)
+
+    def __getstate__(self):
+        # The label ids are only valid in current process,
+        # so the labels are pickled by their names.
+        labels = [label_name(v) for v in self.labels]
+        return (labels, self.starts, self.ends, self.parents,
+                self.sentence, self.poss, self.length)
+
+    def __setstate__(self, state):
+        labels, self.starts, self.ends, self.parents, \
+            self.sentence, self.poss, self.length = state
+        self.labels = array.array('i', map(label_id, labels))
@@ -0,0 +1,127 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 13:40:02
+# Last modified: 2026-10-18 13:40:02
+
+"""
+Parsed treebank which can be reused by many evaluations.
+
+The gold treebank is parsed once into CompactTree, and can be
+scored against any number of test treebanks:
+
+    gold = Treebank.load('gold.txt', cache_path='gold.cache')
+    scorer.evalb(gold, 'test1.txt', 'result1.txt')
+    scorer.evalb(gold, 'test2.txt', 'result2.txt')
+
+The cache file records the sha1 of the treebank file, so it is
+rebuilt automatically when the treebank file changes.
+"""
+
+import io
+import os
+
+from .parser import ParsingError
+from .tree import CompactTree
+from . import parser
+
+# Bump it when the layout of the cache changes.
+CACHE_VERSION = 2
+
+
+class Treebank:
+    """A list of parsed trees.
+
+    Each item is an instance of CompactTree, or the ParsingError
+    raised by the line which can not be parsed.
+
+    Attributes:
+        digest: the sha1 of the treebank file.
+    """
+    def __init__(self, trees, digest=None):
+        self._trees = trees
+        self.digest = digest
+
+    @classmethod
+    def from_lines(cls, lines, digest=None):
+        """Parse a treebank from an iterator of bracket strings.
+        """
+        trees = []
+        for line in lines:
+            try:
+                root = parser._create_root(line)
+                trees.append(CompactTree(root))
+            except ParsingError as e:
+                trees.append(e)
+        return cls(trees, digest)
+
+    @classmethod
+    def load(cls, path, cache_path=None):
+        """Load a treebank file.
+
+        Args:
+            path: the path of the treebank.
+            cache_path: the path of the cache. If it is given, the
+                        parsed trees are read from the cache when
+                        the cache matches the content of the file,
+                        otherwise the cache is written.
+
+        Returns:
+            An instance of Treebank.
+        """
+        import hashlib
+        import pickle
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+
+        if cache_path is not None and os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                try:
+                    version, cache_digest, trees = pickle.load(f)
+                except (pickle.UnpicklingError, EOFError, ValueError,
+                        AttributeError, ImportError, TypeError):
+                    version, cache_digest = None, None
+            if version == CACHE_VERSION and cache_digest == digest:
+                return cls(trees, digest)
+
+        lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf8')
+        treebank = cls.from_lines(lines, digest)
+        if cache_path is not None:
+            treebank.save(cache_path)
+        return treebank
+
+    def save(self, cache_path):
+        """Write the parsed trees into the cache file.
+        """
+        import pickle
+
+        with open(cache_path, 'wb') as f:
+            pickle.dump((CACHE_VERSION, self.digest, self._trees), f,
+                        pickle.HIGHEST_PROTOCOL)
+
+    def tree(self, index):
+        """Return the tree of the sentence.
+
+        Raises:
+            ParsingError: if the sentence can not be parsed.
+        """
+        tree = self._trees[index]
+        if isinstance(tree, ParsingError):
+            raise tree
+        return tree
+
+    def __getitem__(self, index):
+        return self._trees[index]
+
+    def __iter__(self):
+        return iter(self._trees)
+
+    def __len__(self):
+        return len(self._trees)
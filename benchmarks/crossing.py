@@ -0,0 +1,76 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 11:05:12
+# Last modified: 2026-10-18 11:05:12
+
+"""
+Benchmark of the crossing brackets counting.
+
+Compare the sparse table counting with the naive O(U*G) loop
+on random binary trees of growing length:
+
+    python -m benchmarks.crossing
+"""
+
+import random
+import timeit
+
+from PYEVALB.scorer import _count_crossing
+from PYEVALB.tree import Span
+
+LENGTHS = [10, 25, 50, 100, 200, 400, 800]
+
+
+def naive(spans, gold_spans):
+    """The counting used before, kept as the reference.
+    """
+    counter = 0
+    for u in spans:
+        for g in gold_spans:
+            if (u.s < g.s and u.e > g.s and u.e < g.e):
+                counter += 1
+                break
+            elif (u.s > g.s and u.s < g.e and u.e > g.e):
+                counter += 1
+                break
+    return counter
+
+
+def random_spans(rand, s, e, spans):
+    """Collect the spans of a random binary tree over [s, e).
+    """
+    spans.append(Span(s, e))
+    if e - s > 1:
+        m = rand.randint(s + 1, e - 1)
+        random_spans(rand, s, m, spans)
+        random_spans(rand, m, e, spans)
+    return spans
+
+
+def main():
+    rand = random.Random(1217)
+    print('{0:>8} {1:>8} {2:>12} {3:>12} {4:>8}'.format(
+        'length', 'spans', 'naive(ms)', 'sparse(ms)', 'speedup'))
+    for length in LENGTHS:
+        gold_spans = random_spans(rand, 0, length, [])
+        test_spans = random_spans(rand, 0, length, [])
+        assert naive(test_spans, gold_spans) == _count_crossing(
+                test_spans, gold_spans)
+
+        number = max(1, 2000 // length)
+        a = timeit.timeit(lambda: naive(test_spans, gold_spans),
+                          number=number) / number * 1000
+        b = timeit.timeit(lambda: _count_crossing(test_spans, gold_spans),
+                          number=number) / number * 1000
+        print('{0:>8d} {1:>8d} {2:>12.3f} {3:>12.3f} {4:>8.1f}'.format(
+            length, len(gold_spans), a, b, a / b))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 22:41:26
+# Last modified: 2026-10-18 22:41:26
+
+"""
+Seeded generator of synthetic treebanks.
+
+The gold trees are random trees over random words, the test trees
+are the gold trees with noise: relabeled, flattened and inserted
+brackets, and wrong pos tags. The words are never changed, so every
+pair can be scored. The same seed gives the same treebanks:
+
+    python -m benchmarks.generate gold.txt test.txt --sentences 2000
+"""
+
+import argparse
+import random
+
+# The first labels are the common ones of Penn Treebank.
+LABELS = ['NP', 'VP', 'PP', 'S', 'SBAR', 'ADJP', 'ADVP', 'QP', 'WHNP',
+          'PRN']
+TAGS = ['NN', 'NNS', 'NNP', 'DT', 'JJ', 'IN', 'VB', 'VBD', 'VBZ', 'RB',
+        'CC', 'CD', 'PRP', 'TO', 'MD']
+
+
+class Generator:
+    """Random gold and test trees.
+
+    A tree is a tuple (label, children), and a pos tag node is
+    a tuple (tag, word).
+    """
+    def __init__(self, seed=1217, min_length=5, max_length=40,
+                 max_depth=8, branching=3, labels=20, tags=30,
+                 words=1000, noise=0.1):
+        """Construct a new generator.
+
+        Args:
+            seed: the seed of the random generator
+            min_length: the minimum number of words of a sentence
+            max_length: the maximum number of words of a sentence
+            max_depth: the maximum depth of label nodes
+            branching: the maximum number of children of a label node
+            labels: the size of the label vocabulary
+            tags: the size of the pos tag vocabulary
+            words: the size of the word vocabulary
+            noise: the probability to change each bracket and tag
+                   of the test trees
+        """
+        self.params = dict(seed=seed, min_length=min_length,
+                           max_length=max_length, max_depth=max_depth,
+                           branching=branching, labels=labels, tags=tags,
+                           words=words, noise=noise)
+        self._rand = random.Random(seed)
+        self._labels = _vocabulary(LABELS, 'X', labels)
+        self._tags = _vocabulary(TAGS, 'T', tags)
+        self._words = ['w{0}'.format(i) for i in range(words)]
+        self._min_length = min_length
+        self._max_length = max_length
+        self._max_depth = max_depth
+        self._branching = max(2, branching)
+        self._noise = noise
+
+    def pair(self):
+        """Return a pair of (gold, test) bracket strings.
+        """
+        length = self._rand.randint(self._min_length, self._max_length)
+        words = [self._rand.choice(self._words) for _ in range(length)]
+        gold = self._tree(words, 0)
+        test = self._noisy(gold)
+        return _to_bracket(gold), _to_bracket(test)
+
+    def corpus(self, sentences):
+        """Return the lists of gold and test bracket strings.
+        """
+        pairs = [self.pair() for _ in range(sentences)]
+        return [v[0] for v in pairs], [v[1] for v in pairs]
+
+    def _tree(self, words, depth):
+        rand = self._rand
+        label = rand.choice(self._labels)
+        if depth + 1 >= self._max_depth or len(words) == 1:
+            return (label, [self._pos(word) for word in words])
+
+        size = min(len(words), rand.randint(2, self._branching))
+        cuts = sorted(rand.sample(range(1, len(words)), size - 1))
+        children = []
+        for s, e in zip([0] + cuts, cuts + [len(words)]):
+            if e - s == 1:
+                children.append(self._pos(words[s]))
+            else:
+                children.append(self._tree(words[s:e], depth + 1))
+        return (label, children)
+
+    def _pos(self, word):
+        return (self._rand.choice(self._tags), word)
+
+    def _noisy(self, node):
+        """Copy the tree with noise.
+        """
+        rand = self._rand
+        label, children = node
+        if isinstance(children, str):
+            if rand.random() < self._noise:
+                label = rand.choice(self._tags)
+            return (label, children)
+
+        new_children = []
+        for child in children:
+            child = self._noisy(child)
+            # Flatten the child into this node
+            if (not isinstance(child[1], str) and
+                    rand.random() < self._noise):
+                new_children.extend(child[1])
+            else:
+                new_children.append(child)
+        # Group two neighbour children into a new bracket
+        if len(new_children) > 2 and rand.random() < self._noise:
+            i = rand.randrange(len(new_children) - 1)
+            group = (rand.choice(self._labels), new_children[i:i+2])
+            new_children[i:i+2] = [group]
+        if rand.random() < self._noise:
+            label = rand.choice(self._labels)
+        return (label, new_children)
+
+
+########################################################
+# Helping methods
+########################################################
+
+
+def _vocabulary(names, prefix, size):
+    names = names[:size]
+    names += ['{0}{1}'.format(prefix, i) for i in range(size - len(names))]
+    return names
+
+
+def _to_bracket(node):
+    """Return the bracket string of the tree, without recursion.
+    """
+    items = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            items.append(node)
+            continue
+        label, children = node
+        if isinstance(children, str):
+            items.append('(' + label + ' ' + children + ')')
+            continue
+        items.append('(' + label)
+        stack.append(')')
+        stack.extend(reversed(children))
+    # No space before the closing brackets
+    return ' '.join(items).replace(' )', ')')
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('gold_path', help='The path of gold tree bank.')
+    args.add_argument('test_path', help='The path of test tree bank.')
+    args.add_argument('--sentences', type=int, default=2000)
+    args.add_argument('--seed', type=int, default=1217)
+    args.add_argument('--min-length', type=int, default=5)
+    args.add_argument('--max-length', type=int, default=40)
+    args.add_argument('--max-depth', type=int, default=8)
+    args.add_argument('--branching', type=int, default=3)
+    args.add_argument('--labels', type=int, default=20)
+    args.add_argument('--tags', type=int, default=30)
+    args.add_argument('--noise', type=float, default=0.1)
+    args = args.parse_args()
+
+    generator = Generator(seed=args.seed, min_length=args.min_length,
+                          max_length=args.max_length,
+                          max_depth=args.max_depth,
+                          branching=args.branching, labels=args.labels,
+                          tags=args.tags, noise=args.noise)
+    gold, test = generator.corpus(args.sentences)
+    with open(args.gold_path, 'w', encoding='utf8') as f:
+        f.writelines(line + '\n' for line in gold)
+    with open(args.test_path, 'w', encoding='utf8') as f:
+        f.writelines(line + '\n' for line in test)
+
+
+if __name__ == '__main__':
+    main()
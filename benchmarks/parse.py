@@ -0,0 +1,51 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 12:20:31
+# Last modified: 2026-10-18 12:20:31
+
+"""
+Benchmark of the bracket parser.
+
+Parse a treebank several times and report the throughput:
+
+    python -m benchmarks.parse [path] [--repeat N]
+"""
+
+import argparse
+import time
+
+from PYEVALB import parser
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('path', help='The path of a bracket treebank.',
+                      nargs='?', default='./data/score/gold.txt')
+    args.add_argument('--repeat', help='The number of passes.',
+                      type=int, default=200)
+    args = args.parse_args()
+
+    with open(args.path, encoding='utf8') as f:
+        lines = [line for line in f if len(line.strip()) != 0]
+    size = sum(len(line.encode('utf8')) for line in lines)
+
+    for name, func in [('nodes', parser._create_root),
+                       ('trees', parser.create_from_bracket_string)]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for line in lines:
+                func(line)
+        elapsed = time.perf_counter() - start
+        print('{0}: {1:.0f} sentences/sec {2:.2f} MB/sec'.format(
+            name, len(lines) * args.repeat / elapsed,
+            size * args.repeat / elapsed / 1e6))
+
+
+if __name__ == '__main__':
+    main()
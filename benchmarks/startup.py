@@ -0,0 +1,92 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 17:05:21
+# Last modified: 2026-10-18 17:05:21
+
+"""
+Benchmark of the start-up time of the command interface.
+
+Run the command several times and report the wall time, compared
+with a bare interpreter, then list the slowest imports reported by
+-X importtime:
+
+    python -m benchmarks.startup [--repeat N] [-- args of PYEVALB]
+
+The default command is python -m PYEVALB --help.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _wall_time(command, repeat):
+    """Return the median wall time of the command in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def _import_times(command):
+    """Return (cumulative microseconds, module) of the top level imports.
+    """
+    process = subprocess.run(command[:1] + ['-X', 'importtime'] + command[1:],
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE,
+                             universal_newlines=True)
+    reval = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        # Nested imports are indented.
+        if name.startswith('  '):
+            continue
+        reval.append((int(cumulative), name.strip()))
+    return sorted(reval, reverse=True)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--repeat', help='The number of runs.',
+                      type=int, default=20)
+    args.add_argument('--top', help='The number of imports listed.',
+                      type=int, default=10)
+    args.add_argument('command', nargs=argparse.REMAINDER,
+                      help='The arguments of PYEVALB.')
+    args = args.parse_args()
+
+    command = args.command
+    if len(command) != 0 and command[0] == '--':
+        command = command[1:]
+    if len(command) == 0:
+        command = ['--help']
+    command = [sys.executable, '-m', 'PYEVALB'] + command
+
+    bare = _wall_time([sys.executable, '-c', 'pass'], args.repeat)
+    total = _wall_time(command, args.repeat)
+    print('interpreter: {0:.1f} ms'.format(bare))
+    print('PYEVALB: {0:.1f} ms (+{1:.1f} ms)'.format(total, total - bare))
+
+    print('slowest imports:')
+    for cumulative, name in _import_times(command)[:args.top]:
+        print('{0:8.1f} ms  {1}'.format(cumulative / 1000, name))
+
+
+if __name__ == '__main__':
+    main()
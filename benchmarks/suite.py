@@ -0,0 +1,199 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 22:58:09
+# Last modified: 2026-10-18 22:58:09
+
+"""
+Benchmark suite of the scoring stages.
+
+Each stage is timed on its own, on a synthetic treebank of the seeded
+generator, and the best of several passes is reported:
+
+    parse: bracket strings into nodes
+    build: nodes into trees
+    match: scoring two parsed trees
+    crossing: counting the crossing brackets
+    summary: summing up the results
+    write: writing the markdown report
+    corpus: scoring the bracket strings, all stages together
+
+Record a baseline, and compare with it after a change. The exit status
+is 1 if a stage is slower than the baseline by more than the tolerance:
+
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json
+
+The baselines are only comparable on the same machine.
+"""
+
+import argparse
+import collections
+import io
+import json
+import platform
+import sys
+import time
+
+from PYEVALB import parser
+from PYEVALB import report
+from PYEVALB import summary
+from PYEVALB.scorer import Scorer
+from PYEVALB.scorer import _count_crossing
+from PYEVALB.tree import Tree
+
+from .generate import Generator
+
+
+def stages(gold, test):
+    """Return the list of (name, items, function) of the stages.
+
+    The inputs of each stage are prepared before, so that only
+    the stage itself is timed.
+    """
+    lines = gold + test
+    roots = [parser._create_root(line) for line in lines]
+    gold_trees = [Tree(parser._create_root(line)) for line in gold]
+    test_trees = [Tree(parser._create_root(line)) for line in test]
+    pairs = list(zip(gold_trees, test_trees))
+    scorer = Scorer()
+    results = [scorer._score_trees(g, t) for g, t in pairs]
+    spans = []
+    for g, t in pairs:
+        common = set(g.bracket_keys)
+        spans.append(([span for span, key
+                       in zip(t.bracket_spans, t.bracket_keys)
+                       if key not in common], g.bracket_spans))
+    s = summary.summary(results)
+
+    def parse():
+        for line in lines:
+            parser._create_root(line)
+
+    def build():
+        for root in roots:
+            Tree(root)
+
+    def match():
+        for g, t in pairs:
+            scorer._score_trees(g, t)
+
+    def crossing():
+        for unmatched, gold_spans in spans:
+            _count_crossing(unmatched, gold_spans)
+
+    def summarize():
+        accumulator = summary.Accumulator()
+        for result in results:
+            accumulator.add(result)
+        accumulator.summary()
+
+    def write():
+        writer = report.MarkdownWriter(io.StringIO())
+        writer.write_header()
+        for result in results:
+            writer.write_row(result)
+        writer.write_summary(s)
+
+    def corpus():
+        scorer.score_corpus(gold, test)
+
+    return [('parse', len(lines), parse),
+            ('build', len(roots), build),
+            ('match', len(pairs), match),
+            ('crossing', len(spans), crossing),
+            ('summary', len(results), summarize),
+            ('write', len(results), write),
+            ('corpus', len(gold), corpus)]
+
+
+def run(gold, test, repeat):
+    """Time the stages.
+
+    Returns:
+        a dict from the stage names to the items per second
+        of the best pass
+    """
+    results = collections.OrderedDict()
+    for name, items, func in stages(gold, test):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        results[name] = items / best
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print the ratios to the baseline.
+
+    Returns:
+        the list of the stages slower than the baseline
+        by more than the tolerance
+    """
+    regressions = []
+    print('{0:>10} {1:>14} {2:>14} {3:>8}'.format(
+        'stage', 'baseline/s', 'current/s', 'ratio'))
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        ratio = value / baseline[name]
+        flag = ''
+        if ratio < 1 - tolerance:
+            regressions.append(name)
+            flag = ' slower'
+        print('{0:>10} {1:>14.0f} {2:>14.0f} {3:>8.2f}{4}'.format(
+            name, baseline[name], value, ratio, flag))
+    return regressions
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument('--sentences', help='The size of the treebank.',
+                      type=int, default=2000)
+    args.add_argument('--seed', type=int, default=1217)
+    args.add_argument('--repeat', help='The number of passes.',
+                      type=int, default=5)
+    args.add_argument('--save', help='Write the results as a baseline.')
+    args.add_argument('--compare', help='Compare with a baseline.')
+    args.add_argument('--tolerance', help='The allowed slowdown ratio.',
+                      type=float, default=0.2)
+    args = args.parse_args()
+
+    generator = Generator(seed=args.seed)
+    gold, test = generator.corpus(args.sentences)
+    params = dict(generator.params, sentences=args.sentences)
+
+    results = run(gold, test, args.repeat)
+    for name, value in results.items():
+        print('{0:>10}: {1:.0f} items/sec'.format(name, value))
+
+    if args.save is not None:
+        with open(args.save, 'w', encoding='utf8') as f:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'params': params,
+                       'results': results}, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.compare is not None:
+        with open(args.compare, encoding='utf8') as f:
+            baseline = json.load(f)
+        if baseline['params'] != params:
+            print('Warning: the baseline has another treebank: {0}'.format(
+                baseline['params']))
+        print()
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if len(regressions) != 0:
+            print('Regressions: ' + ', '.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
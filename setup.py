@@ -55,6 +55,9 @@ setup(
     include_package_data=True,
     install_requires=install_require,
     tests_require=tests_require,
+    extras_require={
+        'numpy': ['numpy'],
+        },
     entry_points={
         'console_scripts': [
             'PYEVALB = PYEVALB.__main__:main'
@@ -0,0 +1,73 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 16:02:17
+# Last modified: 2026-10-18 16:02:17
+
+"""
+Test for aio.py
+
+The async iterators are driven by hand, so this module can be
+imported by the versions without async generators.
+"""
+import asyncio
+import sys
+
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_equals
+
+from PYEVALB.scorer import Scorer
+
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+
+class Lines:
+    """An async iterator of the lines.
+    """
+    def __init__(self, items):
+        self._items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        try:
+            item = next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+        return asyncio.sleep(0, result=item)
+
+
+class TestAio:
+
+    def setup(self):
+        if sys.version_info < (3, 7):
+            raise SkipTest('The async API needs Python 3.7 or later.')
+
+    def test_ascore_corpus(self):
+        scorer = Scorer()
+        with open(GOLD_PATH, encoding='utf8') as f:
+            gold = f.readlines()
+        with open(TEST_PATH, encoding='utf8') as f:
+            test = f.readlines()
+
+        loop = asyncio.new_event_loop()
+        values = []
+        try:
+            results = scorer.ascore_corpus(Lines(gold), test, batch_size=3)
+            while True:
+                try:
+                    values.append(loop.run_until_complete(
+                        results.__anext__()))
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.close()
+        assert_equals([str(v) for v in scorer.score_corpus(gold, test)],
+                      [str(v) for v in values])
@@ -0,0 +1,90 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 23:48:52
+# Last modified: 2026-10-18 23:48:52
+
+"""
+Test for align.py
+"""
+import os
+
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+from PYEVALB.align import Alignment
+from PYEVALB.scorer import Scorer
+from PYEVALB.summary import ErrorRecord
+from PYEVALB.treebank import Treebank
+
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+
+class TestAlign:
+
+    def setup(self):
+        with open(GOLD_PATH, encoding='utf8') as f:
+            self._gold = f.read().splitlines()
+        with open(TEST_PATH, encoding='utf8') as f:
+            self._test = f.read().splitlines()
+        self._results = [str(v) for v in
+                         Scorer().score_corpus(self._gold, self._test)]
+
+    def test_words(self):
+        # Drop the 4th test sentence and insert one
+        test = (self._test[:3] + self._test[4:6] +
+                ['(S (A extra) (B words))'] + self._test[6:])
+        for gold in [self._gold, Treebank.from_lines(self._gold)]:
+            alignment = Alignment(gold, test)
+            results = list(Scorer().iter_aligned(alignment))
+            assert_equals([v.error.kind for v in results
+                           if v.error is not None], ['missing'])
+            assert_equals(results[3].ID, 3)
+            assert_equals([str(v) for i, v in enumerate(results) if i != 3],
+                          [v for i, v in enumerate(self._results) if i != 3])
+            assert_equals(alignment.inserted, [
+                ErrorRecord('test:5', 'inserted', 'sentence of 2 words')])
+
+    def test_id(self):
+        gold = ['s{0}\t{1}'.format(i, v) for i, v in enumerate(self._gold)]
+        test = ['s{0}\t{1}'.format(i, v) for i, v in enumerate(self._test)]
+        test = list(reversed(test[1:])) + ['x\t(S (A a))', '(S (A a))']
+        alignment = Alignment(gold, test, key='id')
+        results = list(Scorer().iter_aligned(alignment))
+        assert_equals(results[0].error,
+                      ErrorRecord(0, 'missing', 'no test sentence ID s0'))
+        assert_equals([str(v) for v in results[1:]], self._results[1:])
+        assert_equals([v.message for v in alignment.inserted],
+                      ['sentence ID x', 'broken sentence'])
+        assert_raises(ValueError, Alignment, gold, test, 'line')
+
+        gold_path = './data/score/align_gold.tmp'
+        test_path = './data/score/align_test.tmp'
+        error_path = './data/score/align_error.tmp'
+        try:
+            with open(gold_path, 'w', encoding='utf8') as f:
+                f.writelines(v + '\n' for v in gold)
+            with open(test_path, 'w', encoding='utf8') as f:
+                f.writelines(v + '\n' for v in test)
+            for workers in [1, 2]:
+                s = Scorer().evalb(gold_path, test_path, os.devnull,
+                                   workers=workers, chunk_size=3,
+                                   error_path=error_path, align='id')
+                # The inserted sentences are error sentences too
+                assert_equals((s.sent_num, s.error_sent_num),
+                              (len(gold) + 2, 3))
+                with open(error_path, encoding='utf8') as f:
+                    assert_equals([line.split('\t')[:2] for line in f],
+                                  [['0', 'missing'],
+                                   ['test:9', 'inserted'],
+                                   ['test:10', 'inserted']])
+        finally:
+            for path in [gold_path, test_path, error_path]:
+                if os.path.exists(path):
+                    os.remove(path)
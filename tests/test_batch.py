@@ -0,0 +1,82 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 16:20:37
+# Last modified: 2026-10-18 16:20:37
+
+"""
+Test for batch.py
+"""
+import random
+
+from nose.tools import assert_equals
+
+from PYEVALB import batch
+from PYEVALB import parser
+from PYEVALB import summary
+from PYEVALB.scorer import Scorer
+
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+
+def random_tree(rand, words, labels):
+    """Create a random bracket string over the words.
+    """
+    if len(words) == 1:
+        return '(' + rand.choice(labels) + ' ' + words[0] + ')'
+    children = []
+    i = 0
+    while i < len(words):
+        j = rand.randint(i + 1, len(words))
+        if i == 0 and j == len(words):
+            j = rand.randint(1, len(words) - 1)
+        children.append(random_tree(rand, words[i:j], labels))
+        i = j
+    return '(' + rand.choice(labels) + ' ' + ' '.join(children) + ')'
+
+
+class TestBatch:
+
+    def _check(self, gold_lines, test_lines):
+        scorer = Scorer()
+        results = scorer.score_corpus(gold_lines, test_lines)
+        gold = batch.extract([parser.create_from_bracket_string(line)
+                              for line in gold_lines])
+        test = batch.extract([parser.create_from_bracket_string(line)
+                              for line in test_lines])
+        statistics, value = batch.score_batch(gold, test)
+
+        for name in statistics._fields:
+            assert_equals([getattr(result, name) for result in results],
+                          getattr(statistics, name).tolist())
+        assert_equals(summary.summary(results), value)
+
+    def test_corpus(self):
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                self._check(list(gold), list(test))
+
+    def test_random(self):
+        rand = random.Random(1217)
+        labels = ['NP', 'VP', 'IP', 'NN']
+        gold_lines = []
+        test_lines = []
+        for _ in range(200):
+            words = ['w%d' % i for i in range(rand.randint(2, 30))]
+            gold_lines.append(random_tree(rand, words, labels))
+            test_lines.append(random_tree(rand, words, labels))
+        self._check(gold_lines, test_lines)
+
+    def test_bare_words(self):
+        # The words outside pos tags are covered by brackets, but
+        # not counted in the length of the sentence.
+        gold_lines = ['(S (X a b) (Y c d) (VV e))',
+                      '(S (A (T x) (T y) (T z)))']
+        test_lines = [gold_lines[0], '(S (B (T x) (T y)) (T z))']
+        self._check(gold_lines, test_lines)
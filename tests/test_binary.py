@@ -0,0 +1,104 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 15:10:21
+# Last modified: 2026-10-18 15:10:21
+
+"""
+Test for binary.py
+"""
+import os
+import shutil
+import tempfile
+
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+from PYEVALB.binary import BinaryTreebank
+from PYEVALB import binary
+from PYEVALB import parser
+from PYEVALB.parser import ParsingError
+from PYEVALB.scorer import Scorer
+from PYEVALB.tree import CompactTree
+
+BRACKETED_PATH = './data/tree/BRACKETED.txt'
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+
+class TestBinary:
+
+    def setup(self):
+        self._dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self._dir)
+
+    def _read(self, path):
+        with open(path, encoding='utf8') as f:
+            return [line.strip() for line in f]
+
+    def test_round_trip(self):
+        for path in [BRACKETED_PATH, GOLD_PATH, TEST_PATH]:
+            binary_path = os.path.join(self._dir, 'tree.bin')
+            bracket_path = os.path.join(self._dir, 'tree.txt')
+            binary.convert(path, binary_path)
+            assert binary.is_binary(binary_path)
+            assert not binary.is_binary(path)
+            binary.to_bracket(binary_path, bracket_path)
+
+            ans = [str(parser.create_from_bracket_string(line))
+                   for line in self._read(path)]
+            assert_equals(ans, self._read(bracket_path))
+
+    def test_trees(self):
+        binary_path = os.path.join(self._dir, 'tree.bin')
+        binary.convert(GOLD_PATH, binary_path)
+        lines = self._read(GOLD_PATH)
+        with BinaryTreebank(binary_path) as treebank:
+            assert_equals(len(lines), len(treebank))
+            # Random access
+            for i in [7, 2, -1, 0]:
+                ans = CompactTree.from_tree(
+                        parser.create_from_bracket_string(lines[i]))
+                value = treebank.tree(i)
+                assert_equals(ans.bracket_keys, value.bracket_keys)
+                assert_equals(list(ans.parents), list(value.parents))
+                assert_equals(ans.sentence, value.sentence)
+                assert_equals(ans.poss, value.poss)
+            assert_raises(IndexError, treebank.tree, len(lines))
+
+    def test_score(self):
+        gold_path = os.path.join(self._dir, 'gold.bin')
+        test_path = os.path.join(self._dir, 'test.bin')
+        binary.convert(GOLD_PATH, gold_path)
+        binary.convert(TEST_PATH, test_path)
+
+        scorer = Scorer()
+        ans = scorer.evalb(GOLD_PATH, TEST_PATH,
+                           os.path.join(self._dir, 'ans.md'))
+        with BinaryTreebank(gold_path) as gold, \
+                BinaryTreebank(test_path) as test:
+            value = scorer.evalb(gold, test,
+                                 os.path.join(self._dir, 'value.md'))
+        assert_equals(ans, value)
+
+    def test_special(self):
+        binary_path = os.path.join(self._dir, 'tree.bin')
+        binary.write_binary(['(IP (NP (NN 测试)))', ' ', '(NN a)',
+                             '(IP (NP a b) (VP (VV c)) d)'],
+                            binary_path)
+        with BinaryTreebank(binary_path) as treebank:
+            assert_equals(4, len(treebank))
+            assert_raises(ParsingError, treebank.tree, 1)
+            assert isinstance(treebank[1], ParsingError)
+            assert_equals(('a',), treebank.tree(2).sentence)
+            assert_equals('(NN a)', str(treebank.to_tree(2)))
+            # Words which are not under a pos tag
+            assert_equals('(IP (NP (a ) (b )) (VP (VV c)) (d ))',
+                          str(treebank.to_tree(3)))
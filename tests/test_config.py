@@ -0,0 +1,110 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 21:12:30
+# Last modified: 2026-10-18 21:12:30
+
+"""
+Test for config.py
+"""
+import os
+import pickle
+
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+from PYEVALB.config import Config
+from PYEVALB.scorer import Scorer
+from PYEVALB.tree import CompactTree
+from PYEVALB.tree import label_name
+from PYEVALB import parser
+
+PRM_PATH = './data/prm/COLLINS.prm'
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+GOLD = ('(TOP (S (NP (DT The) (NN cat)) (VP (VBD sat) (PRT (RP down))) '
+        '(, ,) (NP (-NONE- *)) (. .)))')
+TEST = ('(TOP (S (NP (DT The) (NN cat)) (VP (VBD sat) (ADVP (RB down))) '
+        '(, ,) (. .)))')
+
+
+class TestConfig:
+
+    def setup(self):
+        self._config = Config.load(PRM_PATH)
+
+    def _arrays(self, tree):
+        return ([label_name(v) for v in tree.labels], list(tree.starts),
+                list(tree.ends), list(tree.parents), tree.sentence)
+
+    def test_load(self):
+        config = self._config
+        assert_equals(config.delete_labels,
+                      {'TOP', '-NONE-', ',', ':', '``', "''", '.'})
+        assert_equals(config.delete_labels_for_length, {'-NONE-'})
+        assert_equals(config.eq_labels, [('ADVP', 'PRT')])
+        assert_equals(config.cutoff_len, 40)
+        assert_equals(config.labeled, True)
+
+        assert_raises(ValueError, Config.from_lines, ['CUTOFF_LEN'])
+        assert_raises(ValueError, Config.from_lines, ['CUTOFF_LEN x'])
+        assert_raises(ValueError, Config.from_lines, ['EQ_LABEL NP'])
+
+    def test_tree(self):
+        root = parser._create_root(GOLD)
+        expected = (['S', 'NP', 'VP', 'ADVP'], [0, 0, 2, 3], [4, 2, 4, 4],
+                    [-1, 0, 0, 2], ('The', 'cat', 'sat', 'down'))
+        assert_equals(self._arrays(CompactTree(root, self._config)),
+                      expected)
+        assert_equals(self._arrays(
+            CompactTree(root).normalize(self._config)), expected)
+
+        config = pickle.loads(pickle.dumps(Config(labeled=False)))
+        assert_equals(self._arrays(CompactTree(root, config))[0],
+                      ['*'] * 6)
+
+    def test_score(self):
+        gold = parser.create_from_bracket_string(GOLD)
+        test = parser.create_from_bracket_string(TEST)
+        result = Scorer(config=self._config).score_trees(gold, test)
+        assert_equals((result.matched_brackets, result.gold_brackets,
+                       result.length, result.words, result.correct_tags),
+                      (4, 4, 6, 4, 3))
+        # The length of normalized trees is the same
+        result = Scorer(config=self._config).score_trees(
+                CompactTree.from_tree(gold), CompactTree.from_tree(test))
+        assert_equals(result.length, 6)
+        # The trees built with the config are not normalized again
+        result = Scorer(config=self._config).score_trees(
+                CompactTree(gold.root, self._config),
+                CompactTree(test.root, self._config))
+        assert_equals((result.matched_brackets, result.length,
+                       result.words), (4, 6, 4))
+        result = Scorer().score_trees(gold, gold)
+        assert_equals((result.matched_brackets, result.gold_brackets,
+                       result.length), (6, 6, 7))
+
+    def test_cutoff(self):
+        path = './data/score/config.tmp'
+        scorer = Scorer(config=Config(cutoff_len=30))
+        try:
+            s = scorer.evalb(GOLD_PATH, TEST_PATH, path, fmt='jsonl')
+            with open(path, encoding='utf8') as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(path)
+
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                results = scorer.score_corpus(gold, test)
+        short = [v for v in results if v.length <= 30]
+        assert_equals(s, Scorer().evalb(GOLD_PATH, TEST_PATH, os.devnull))
+        assert_equals(lines[-1].count('"len<=30"'), 1)
+        assert_equals(lines[-1].count('"sent_num": {0}.0'.format(
+            len(short))), 1)
@@ -0,0 +1,69 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 19:05:51
+# Last modified: 2026-10-18 19:05:51
+
+"""
+Test for incremental.py
+"""
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+
+from PYEVALB.incremental import IncrementalScorer
+from PYEVALB.scorer import Scorer
+from PYEVALB import summary
+
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+
+class TestIncremental:
+
+    def setup(self):
+        with open(GOLD_PATH, encoding='utf8') as f:
+            self._gold = f.readlines()
+        with open(TEST_PATH, encoding='utf8') as f:
+            self._test = f.readlines()
+
+    def _check(self, evaluation, gold, test):
+        results = Scorer().score_corpus(gold, test)
+        assert_equals([str(v) for v in results],
+                      [str(v) for v in evaluation.results])
+        assert_equals(summary.summary(results), evaluation.summary())
+
+    def test_update(self):
+        evaluation = IncrementalScorer()
+        assert_equals(evaluation.update(self._gold, self._test), 10)
+        self._check(evaluation, self._gold, self._test)
+        assert_equals(evaluation.update(self._gold, self._test), 0)
+
+        # Fix two sentences and break one
+        test = list(self._test)
+        test[1] = self._gold[1]
+        test[4] = self._gold[4]
+        test[7] = '(A (B b'
+        assert_equals(evaluation.update(self._gold, test), 3)
+        self._check(evaluation, self._gold, test)
+
+        # Back to the original
+        assert_equals(evaluation.update(self._gold, self._test), 3)
+        self._check(evaluation, self._gold, self._test)
+
+    def test_resize(self):
+        evaluation = IncrementalScorer()
+        evaluation.update(self._gold, self._test)
+        assert_equals(evaluation.update(self._gold[:6], self._test), 0)
+        assert_equals(len(evaluation), 6)
+        self._check(evaluation, self._gold[:6], self._test[:6])
+
+        assert_equals(evaluation.update_sentence(
+            6, self._gold[6], self._test[6]), True)
+        self._check(evaluation, self._gold[:7], self._test[:7])
+        assert_raises(IndexError, evaluation.update_sentence,
+                      9, self._gold[9], self._test[9])
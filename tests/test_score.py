@@ -12,10 +12,22 @@
 """
 Test class for score.py
 """
+import json
+import os
+import pickle
+import random
+
 from nose.tools import assert_equals
+from nose.tools import assert_raises
 
+from PYEVALB.instrument import Profile
 from PYEVALB.scorer import Result
 from PYEVALB.scorer import Scorer
+from PYEVALB.tree import CompactTree
+from PYEVALB.tree import Span
+from PYEVALB import parser
+from PYEVALB import report
+from PYEVALB import scorer
 from PYEVALB import summary
 
 
@@ -99,3 +111,247 @@ class TestScorer:
         for i, value in enumerate(results):
             ans.ID = i
             assert_equals(str(ans), str(value))
+
+    def test_errors(self):
+        gold = ['(S (A a) (B b))', '(A a)', '(S (A a']
+        test = ['(S (A a) (B c))', '(A a)', '(S (A a))']
+        results = Scorer().score_corpus(gold, test)
+        assert_equals([v.error for v in results],
+                      [summary.ErrorRecord(0, 'words',
+                                           "word 1: gold 'b', test 'c'"),
+                       None,
+                       summary.ErrorRecord(2, 'parse',
+                                           'Parsing Error:'
+                                           'Unbalanced brackets !')])
+        # No brackets
+        assert_equals((results[1].state, results[1].recall), (0, 0))
+
+        path = './data/score/errors.tmp'
+        s = Scorer()
+        try:
+            for workers in [1, 2]:
+                s.evalb(ERROR_GOLD_PATH, ERROR_TEST_PATH, os.devnull,
+                        workers=workers, chunk_size=1, error_path=path)
+                with open(path, encoding='utf8') as f:
+                    lines = [line.split('\t')[:2] for line in f]
+                assert_equals(lines, [['0', 'length'], ['1', 'words']])
+        finally:
+            os.remove(path)
+
+        accumulator = summary.Accumulator()
+        for result in results:
+            accumulator.add(result)
+        assert_equals(accumulator.errors, {'words': 1, 'parse': 1})
+        accumulator.remove(results[0])
+        assert_equals(accumulator.errors, {'parse': 1})
+
+        # The first line of the details by default
+        class Unknown(scorer.ScoreException):
+            kind = 'unknown'
+
+            def details(self):
+                return 'Unknown !\n' + '-' * 30
+        assert_equals(Unknown().message(), 'Unknown !')
+
+    def test_accumulator(self):
+        scorer = Scorer()
+        accumulator = summary.Accumulator()
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                results = scorer.score_corpus(gold, test)
+                gold.seek(0)
+                test.seek(0)
+                for result in scorer.iter_corpus(gold, test):
+                    accumulator.add(result)
+
+        assert_equals(summary.summary(results), accumulator.summary())
+
+    def test_parallel(self):
+        scorer = Scorer()
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                results = scorer.score_corpus(gold, test)
+                gold.seek(0)
+                test.seek(0)
+                accumulator = summary.Accumulator()
+                values = []
+                for chunk, partial in scorer.iter_corpus_parallel(
+                        gold, test, workers=2, chunk_size=3):
+                    accumulator.merge(partial)
+                    values += chunk
+
+        assert_equals([str(v) for v in results], [str(v) for v in values])
+        assert_equals(summary.summary(results), accumulator.summary())
+
+    def test_crossing(self):
+        def naive(spans, gold_spans):
+            counter = 0
+            for u in spans:
+                for g in gold_spans:
+                    if (u.s < g.s < u.e < g.e) or (g.s < u.s < g.e < u.e):
+                        counter += 1
+                        break
+            return counter
+
+        rand = random.Random(1217)
+        for _ in range(300):
+            length = rand.randint(1, 30)
+            spans = []
+            for _ in range(rand.randint(0, 40)):
+                s = rand.randint(0, length - 1)
+                spans.append(Span(s, rand.randint(s + 1, length)))
+            gold_spans = spans[:rand.randint(0, len(spans))]
+            assert_equals(naive(spans, gold_spans),
+                          scorer._count_crossing(spans, gold_spans))
+
+    def test_compact(self):
+        scorer = Scorer()
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                for gold_line, test_line in zip(gold, test):
+                    gold_tree = parser.create_from_bracket_string(gold_line)
+                    test_tree = parser.create_from_bracket_string(test_line)
+                    ans = scorer.score_trees(gold_tree, test_tree)
+                    value = scorer.score_trees(
+                            CompactTree.from_tree(gold_tree),
+                            CompactTree.from_tree(test_tree))
+                    assert_equals(str(ans), str(value))
+                    value = scorer.score_trees(
+                            gold_tree, CompactTree.from_tree(test_tree))
+                    assert_equals(str(ans), str(value))
+
+    def test_result(self):
+        result = Result()
+        result.matched_brackets = 3
+        assert_equals(3, result.matched_brackets)
+        assert_raises(AttributeError, setattr, result, 'unknown', 1)
+        value = pickle.loads(pickle.dumps(result))
+        assert_equals(str(result), str(value))
+
+    def test_labels(self):
+        scorer = Scorer(labels=True, confusion=True)
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                results = scorer.score_corpus(gold, test)
+                gold.seek(0)
+                test.seek(0)
+                parallel = summary.Accumulator()
+                for _, partial in scorer.iter_corpus_parallel(
+                        gold, test, workers=2, chunk_size=3):
+                    parallel.merge(partial)
+
+        accumulator = summary.Accumulator()
+        for result in results:
+            accumulator.add(result)
+        labels = accumulator.label_summary()
+        for name in ['matched_brackets', 'gold_brackets', 'test_brackets']:
+            assert_equals(sum(getattr(v, name) for v in labels),
+                          getattr(accumulator, name))
+        assert_equals(parallel.label_summary(), labels)
+        assert_equals(parallel.confusion, accumulator.confusion)
+        for v in labels:
+            assert_equals(accumulator.confusion.get((v.label, v.label), 0),
+                          v.matched_brackets)
+
+        # Removing all the results clears the counters.
+        for result in results:
+            accumulator.remove(result)
+        assert_equals(accumulator.labels, {})
+        assert_equals(accumulator.confusion, {})
+
+    def test_buckets(self):
+        scorer = Scorer(buckets=[20, (20, 40), 20])
+        path = './data/score/buckets.tmp'
+        try:
+            scorer.evalb(GOLD_PATH, TEST_PATH, path, workers=2,
+                         chunk_size=3, fmt='jsonl')
+            with open(path, encoding='utf8') as f:
+                rows = [json.loads(line) for line in f]
+        finally:
+            os.remove(path)
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                results = scorer.score_corpus(gold, test)
+
+        rows = [row for row in rows if 'name' in row]
+        assert_equals([row['name'] for row in rows],
+                      ['len<=20', '20<len<=40'])
+        for row, (low, high) in zip(rows, [(-1, 20), (20, 40)]):
+            expected = summary.summary(
+                    [v for v in results if low < v.length <= high])
+            assert_equals(row['summary'], expected._asdict())
+
+    def test_buckets_error(self):
+        gold = ['(S (A a) (B b))', '(S (A a', '(S (A a) (B b))']
+        test = ['(S (A a) (B c))', '(S (A a))', '(S (A a) (B b))']
+        buckets = summary.Buckets([1, (1, 2)])
+        for result in Scorer().score_corpus(gold, test):
+            buckets.add(result)
+        # The length of error sentences is unknown
+        assert_equals([(name, s.sent_num) for name, s
+                       in buckets.summaries()],
+                      [('len<=1', 0), ('1<len<=2', 1)])
+
+    def test_profile(self):
+        profile = Profile()
+        scorer = Scorer(profile=profile)
+        s = scorer.evalb(GOLD_PATH, TEST_PATH, os.devnull)
+        assert_equals(s, Scorer().evalb(GOLD_PATH, TEST_PATH, os.devnull))
+        stats = profile.stats()
+        assert_equals(stats['sentences'], 10)
+        assert_equals(stats['stages']['parse']['calls'], 20)
+        assert_equals(stats['stages']['match']['calls'], 10)
+        # header, 10 rows and summary
+        assert_equals(stats['stages']['write']['calls'], 12)
+
+        scorer.evalb(GOLD_PATH, TEST_PATH, os.devnull, workers=2,
+                     chunk_size=3)
+        assert_equals(profile.stats()['stages']['match']['calls'], 20)
+
+    def test_report_format(self):
+        scorer = Scorer()
+        path = './data/score/report.tmp'
+        try:
+            for fmt in report.WRITERS:
+                s = scorer.evalb(GOLD_PATH, TEST_PATH, path, fmt=fmt)
+                with open(path, encoding='utf8') as f:
+                    lines = f.read().splitlines()
+                if fmt == 'jsonl':
+                    assert_equals(json.loads(lines[-1])['summary'],
+                                  s._asdict())
+                    assert_equals(json.loads(lines[0])['ID'], 0)
+                elif fmt != 'markdown':
+                    sep = '\t' if fmt == 'tsv' else ','
+                    assert_equals(lines[0].split(sep),
+                                  Result.STATISTICS_TABLE)
+                    assert_equals(lines[-1].split(sep),
+                                  ['Tagging accuracy',
+                                   '{0:.2f}'.format(s.tagging_accuracy)])
+        finally:
+            os.remove(path)
+        assert_raises(ValueError, report.get_writer, 'html', None)
+
+    def test_summary_merge(self):
+        scorer = Scorer()
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                results = scorer.score_corpus(gold, test)
+
+        accumulator = summary.Accumulator()
+        for i in range(0, len(results), 3):
+            partial = summary.Accumulator()
+            for result in results[i:i+3]:
+                partial.add(result)
+            accumulator.merge(partial)
+        assert_equals(summary.summary(results), accumulator.summary())
+
+    def test_summary_empty(self):
+        value = summary.summary([])
+        assert_equals(summary.Summary(*([0.0] * len(value))), value)
+
+        error = Result()
+        error.state = 2
+        value = summary.summary([error])
+        assert_equals(1, value.sent_num)
+        assert_equals(1, value.error_sent_num)
+        assert_equals(0, value.bracket_recall)
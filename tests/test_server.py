@@ -0,0 +1,112 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 18:02:36
+# Last modified: 2026-10-18 18:02:36
+
+"""
+Test for server.py
+"""
+import io
+import json
+
+from nose.tools import assert_equals
+from nose.tools import assert_in
+
+from PYEVALB.scorer import Scorer
+from PYEVALB.server import Server
+from PYEVALB.server import serve_stdio
+from PYEVALB import summary
+
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+
+class TestServer:
+
+    def setup(self):
+        self._server = Server()
+        self._server.load('dev', GOLD_PATH)
+        with open(GOLD_PATH, encoding='utf8') as gold:
+            with open(TEST_PATH, encoding='utf8') as test:
+                self._results = Scorer().score_corpus(gold, test)
+        self._summary = summary.summary(self._results)._asdict()
+
+    def test_score(self):
+        response = self._server.handle(
+                {'id': 1, 'op': 'score', 'gold': 'dev',
+                 'test_path': TEST_PATH})
+        assert_equals(response['id'], 1)
+        assert_equals(response['summary'], self._summary)
+        assert_equals(response['results'],
+                      [result.todict() for result in self._results])
+
+    def test_batch(self):
+        with open(TEST_PATH, encoding='utf8') as f:
+            lines = f.readlines()
+        # All the requests are queued before the thread starts,
+        # so they are handled as one batch.
+        futures = [self._server.submit({'id': i, 'op': 'score',
+                                        'gold': 'dev', 'test': lines,
+                                        'results': False})
+                   for i in range(4)]
+        futures.append(self._server.submit({'id': 4, 'op': 'unload',
+                                            'name': 'dev'}))
+        futures.append(self._server.submit({'id': 5, 'op': 'score',
+                                            'gold': 'dev', 'test': lines}))
+        self._server.start()
+        responses = [future.result() for future in futures]
+        self._server.stop()
+
+        for i in range(4):
+            assert_equals(responses[i], {'id': i, 'summary': self._summary})
+        assert_equals(responses[4], {'id': 4, 'ok': True})
+        assert_in('error', responses[5])
+
+    def test_stdio(self):
+        requests = [{'id': 1, 'op': 'score', 'gold': 'dev',
+                     'test_path': TEST_PATH, 'results': False},
+                    {'id': 2, 'op': 'nothing'},
+                    {'id': 3, 'op': 'shutdown'},
+                    {'id': 4, 'op': 'score', 'gold': 'dev',
+                     'test_path': TEST_PATH}]
+        stdin = io.StringIO(''.join(json.dumps(request) + '\n'
+                                    for request in requests))
+        stdout = io.StringIO()
+        serve_stdio(self._server, stdin, stdout)
+
+        responses = [json.loads(line) for line in
+                     stdout.getvalue().splitlines()]
+        assert_equals([response['id'] for response in responses], [1, 2, 3])
+        assert_equals(responses[0]['summary'], self._summary)
+        assert_in('error', responses[1])
+
+    def test_stdio_order(self):
+        class Deferred(Server):
+            # All the requests are queued before the thread starts
+            def start(self):
+                pass
+
+            def stop(self):
+                Server.start(self)
+                Server.stop(self)
+
+        server = Deferred()
+        server.load('a', GOLD_PATH)
+        server.load('b', GOLD_PATH)
+        requests = [{'id': i, 'op': 'score', 'gold': gold,
+                     'test_path': TEST_PATH, 'results': False}
+                    for i, gold in [(1, 'a'), (2, 'b'), (3, 'a')]]
+        stdin = io.StringIO(''.join(json.dumps(request) + '\n'
+                                    for request in requests))
+        stdout = io.StringIO()
+        serve_stdio(server, stdin, stdout)
+
+        responses = [json.loads(line) for line in
+                     stdout.getvalue().splitlines()]
+        assert_equals([response['id'] for response in responses], [1, 2, 3])
@@ -0,0 +1,65 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 19:58:14
+# Last modified: 2026-10-18 19:58:14
+
+"""
+Test for significance.py
+"""
+import numpy as np
+from nose.tools import assert_almost_equals
+from nose.tools import assert_equals
+from nose.tools import assert_true
+
+from PYEVALB.scorer import Scorer
+from PYEVALB import significance
+from PYEVALB import summary
+
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+
+
+class TestSignificance:
+
+    def setup(self):
+        with open(GOLD_PATH, encoding='utf8') as f:
+            gold = f.readlines()
+        with open(TEST_PATH, encoding='utf8') as f:
+            test = f.readlines()
+        scorer = Scorer()
+        self._results = scorer.score_corpus(gold, test)
+        self._test = significance.counts(self._results)
+        self._gold = significance.counts(scorer.score_corpus(gold, gold))
+
+    def test_scores(self):
+        s = summary.summary(self._results)
+        values = significance.scores(np.stack(self._test, axis=1).sum(0))
+        assert_almost_equals(float(values['fmeasure']), s.bracker_fmeasure)
+        assert_almost_equals(float(values['recall']), s.bracket_recall)
+        assert_almost_equals(float(values['prec']), s.bracket_prec)
+        assert_almost_equals(float(values['tagging_accuracy']),
+                             s.tagging_accuracy)
+
+    def test_confidence_interval(self):
+        intervals = significance.confidence_interval(
+                self._test, resamples=500, seed=1)
+        assert_equals(intervals, significance.confidence_interval(
+                self._test, resamples=500, seed=1, chunk_size=7))
+        for interval in intervals.values():
+            assert_true(interval.low <= interval.value <= interval.high)
+
+    def test_paired(self):
+        for test in [significance.paired_bootstrap,
+                     significance.approximate_randomization]:
+            same = test(self._test, self._test, 200, seed=0)
+            assert_equals(same['fmeasure'], (0.0, 1.0))
+
+            better = test(self._gold, self._test, 1000, seed=0)
+            assert_true(better['fmeasure'].delta > 0)
+            assert_true(better['fmeasure'].p_value < 0.01)
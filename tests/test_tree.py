@@ -13,12 +13,16 @@
 Test for parser.py
 """
 
+import pickle
+
 from nose.tools import assert_equals
 from nose.tools import assert_not_equals
 from nose.tools import assert_raises
 
 from PYEVALB import parser
+from PYEVALB.tree import CompactTree
 from PYEVALB.tree import Tree
+from PYEVALB.tree import label_name
 
 
 BRACKETED_PATH = './data/tree/BRACKETED.txt'
@@ -114,3 +118,55 @@ class TestParser:
         assert_raises(parser.ParsingError,
                       parser.create_from_bracket_string,
                       ' ')
+        for s in [')', '()', 'a b', '(NN a))', '(A (B b']:
+            assert_raises(parser.ParsingError,
+                          parser.create_from_bracket_string,
+                          s)
+
+    def test_key(self):
+        s = ('(IP (NP (NN 一个)) (NP  (NN 一个) (NN 测试)))')
+        tree = parser.create_from_bracket_string(s)
+        keys = [node.key for node in tree.non_terminals]
+        assert_equals(len(keys), len(set(keys)))
+
+        other = parser.create_from_bracket_string(s)
+        assert_equals(keys, [node.key for node in other.non_terminals])
+        assert_equals(tree.non_terminals, other.non_terminals)
+
+    def test_deep_tree(self):
+        s = '(NN 测试)'
+        for i in range(5000):
+            s = '(NP ' + s + ')'
+        tree = parser.create_from_bracket_string(s)
+        assert_equals(5001, tree.depth)
+        assert_equals(5000, len(tree.non_terminal_labels))
+        assert_equals(['测试'], tree.sentence)
+
+    def test_underscore(self):
+        s = ('(IP (NP (NN a_b)) (VP (VV c)))')
+        tree = parser.create_from_bracket_string(s)
+        assert_equals(['a_b', 'c'], tree.sentence)
+        assert_equals(['NN', 'VV'], tree.poss)
+        assert_equals(['a_b_NN', 'c_VV'], tree.pos_sentence)
+
+    def test_compact(self):
+        s = ('(IP (VP 这是) (NP  (NN 一个) (NN 测试)))')
+        tree = parser.create_from_bracket_string(s)
+        compact = CompactTree.from_tree(tree)
+        assert_equals(['IP', 'NP'], [label_name(v) for v in compact.labels])
+        assert_equals([0, 1], list(compact.starts))
+        assert_equals([3, 3], list(compact.ends))
+        assert_equals([-1, 0], list(compact.parents))
+        assert_equals(tree.bracket_keys, compact.bracket_keys)
+        assert_equals(tree.bracket_spans, compact.bracket_spans)
+        assert_equals(tuple(tree.sentence), compact.sentence)
+        assert_equals(tuple(tree.poss), compact.poss)
+
+    def test_compact_pickle(self):
+        s = ('(IP (VP 这是) (NP  (NN 一个) (NN 测试)))')
+        compact = CompactTree.from_tree(parser.create_from_bracket_string(s))
+        state = compact.__getstate__()
+        assert_equals(['IP', 'NP'], state[0])
+        value = pickle.loads(pickle.dumps(compact))
+        assert_equals(compact.bracket_keys, value.bracket_keys)
+        assert_equals(compact.sentence, value.sentence)
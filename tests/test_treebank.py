@@ -0,0 +1,97 @@
+# !/usr/bin/env python3
+# -*- coding:utf-8 -*-
+#
+# Author: Flyaway - flyaway1217@gmail.com
+# Blog: zhouyichu.com
+#
+# Python release: 3.4.1
+#
+# Date: 2026-10-18 13:58:45
+# Last modified: 2026-10-18 13:58:45
+
+"""
+Test for treebank.py
+"""
+import os
+import shutil
+import tempfile
+
+from nose.tools import assert_equals
+from nose.tools import assert_not_equals
+
+from PYEVALB.scorer import Scorer
+from PYEVALB.treebank import Treebank
+from PYEVALB import summary
+
+GOLD_PATH = './data/score/gold.txt'
+TEST_PATH = './data/score/test.txt'
+ERROR_GOLD_PATH = './data/score/gold_exception.txt'
+ERROR_TEST_PATH = './data/score/test_exception.txt'
+
+
+class TestTreebank:
+
+    def setup(self):
+        self._dir = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self._dir)
+
+    def test_score(self):
+        scorer = Scorer()
+        gold = Treebank.load(GOLD_PATH)
+        for gold_path, test_path in [(GOLD_PATH, TEST_PATH),
+                                     (ERROR_GOLD_PATH, ERROR_TEST_PATH)]:
+            with open(gold_path, encoding='utf8') as gold_f:
+                with open(test_path, encoding='utf8') as test_f:
+                    ans = scorer.score_corpus(gold_f, test_f)
+            gold = Treebank.load(gold_path)
+            with open(test_path, encoding='utf8') as test_f:
+                value = scorer.score_corpus(gold, test_f)
+            assert_equals([str(v) for v in ans], [str(v) for v in value])
+
+    def test_evalb(self):
+        scorer = Scorer()
+        ans_path = os.path.join(self._dir, 'ans.md')
+        value_path = os.path.join(self._dir, 'value.md')
+        ans = scorer.evalb(GOLD_PATH, TEST_PATH, ans_path)
+        value = scorer.evalb(Treebank.load(GOLD_PATH), TEST_PATH, value_path)
+        assert_equals(ans, value)
+        with open(ans_path, encoding='utf8') as f:
+            with open(value_path, encoding='utf8') as g:
+                assert_equals(f.read(), g.read())
+
+    def test_cache(self):
+        gold_path = os.path.join(self._dir, 'gold.txt')
+        cache_path = os.path.join(self._dir, 'gold.cache')
+        shutil.copy(GOLD_PATH, gold_path)
+
+        first = Treebank.load(gold_path, cache_path)
+        assert os.path.exists(cache_path)
+        second = Treebank.load(gold_path, cache_path)
+        assert_equals(first.digest, second.digest)
+        assert_equals([t.bracket_keys for t in first],
+                      [t.bracket_keys for t in second])
+
+        # The cache is rebuilt when the treebank changes
+        with open(gold_path, 'w', encoding='utf8') as f:
+            f.write('(IP (NP (NN 测试)))\n')
+        third = Treebank.load(gold_path, cache_path)
+        assert_not_equals(first.digest, third.digest)
+        assert_equals(1, len(third))
+        assert_equals(1, len(Treebank.load(gold_path, cache_path)))
+
+        # The cache is rebuilt when it refers to missing classes
+        for data in [b'cPYEVALB.tree\nMissing\n.', b'cmissing\nTree\n.']:
+            with open(cache_path, 'wb') as f:
+                f.write(data)
+            assert_equals(1, len(Treebank.load(gold_path, cache_path)))
+
+    def test_error(self):
+        treebank = Treebank.from_lines(['(IP (NP (NN 测试)))', ' '])
+        with open(TEST_PATH, encoding='utf8') as test_f:
+            results = Scorer().score_corpus(treebank, test_f)
+        accumulator = summary.Accumulator()
+        for result in results:
+            accumulator.add(result)
+        assert_equals(2, accumulator.error_sent_num)